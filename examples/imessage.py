@@ -30,17 +30,37 @@ NOTES:
 - The server reads your local iMessage database in read-only mode
 - No messages are modified or deleted
 - Configure IMESSAGES_DB_PATH environment variable to use a different database location
+- Contacts are read from the Contacts app databases (ADDRESSBOOK_PATH), falling back
+  to AppleScript when they aren't readable
 """
 
+import atexit
+import base64
+import bisect
+import hashlib
+import json
 import os
+import queue
+import re
+import select
 import sqlite3
 import subprocess
-from datetime import datetime
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta
+from functools import cache, lru_cache, wraps
+from itertools import islice
 from pathlib import Path
 from typing import Optional, Dict, List, Any
+
+import anyio.to_thread
 from dotenv import load_dotenv
 
 from fastmcp import FastMCP
+from fastmcp.utilities.logging import get_logger
 
 # Load environment variables
 load_dotenv()
@@ -48,11 +68,111 @@ load_dotenv()
 # Get the database path from environment variable
 IMESSAGES_DB_PATH = os.getenv("IMESSAGES_DB_PATH", str(Path.home() / "Library/Messages/chat.db"))
 
-mcp = FastMCP("iMessage Server")
-
-# Global contact cache
-CONTACT_CACHE = None
-CONTACT_PHONE_LOOKUP = None
+# Sidecar database holding the indexes we build over chat.db (which is never written to)
+IMESSAGES_INDEX_PATH = os.getenv(
+    "IMESSAGES_INDEX_PATH", str(Path.home() / ".cache/fastmcp/imessage_index.db")
+)
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Start building the sidecar indexes and the contact snapshot in the background"""
+    threading.Thread(target=warm_indexes, name="imessage-index-warmup", daemon=True).start()
+    threading.Thread(target=warm_contacts, name="imessage-contacts", daemon=True).start()
+    yield
+
+
+mcp = FastMCP("iMessage Server", lifespan=lifespan)
+
+# Contacts app storage; read directly instead of over AppleScript when accessible
+ADDRESSBOOK_PATH = os.getenv(
+    "ADDRESSBOOK_PATH", str(Path.home() / "Library/Application Support/AddressBook")
+)
+
+# On-disk copy of the last AppleScript contact dump, reused across restarts while
+# Contacts is unchanged
+CONTACTS_CACHE_PATH = os.getenv(
+    "CONTACTS_CACHE_PATH", str(Path.home() / ".cache/fastmcp/imessage_contacts.json")
+)
+
+# Compiled (.scpt) copies of our AppleScripts, named by a hash of their source
+APPLESCRIPT_CACHE_DIR = os.getenv(
+    "APPLESCRIPT_CACHE_DIR", str(Path.home() / ".cache/fastmcp/applescript")
+)
+
+# Snapshot of every contact (names, labelled phones and emails, ids) behind the
+# contact tools, rebuilt when the Contacts databases change
+_contacts_cache: dict[str, Any] = {
+    "signature": None,
+    "loaded_at": 0.0,
+    "source": None,
+    "data": None,
+    "by_name_lower": None,
+    "by_trigram": None,
+    "by_phone": None,
+    "by_email": None,
+}
+_CONTACTS_SNAPSHOT_LOCK = threading.Lock()
+
+# Seconds a snapshot is trusted for when the Contacts databases can't be stat'ed
+CONTACTS_TTL = 300
+
+# Seconds a saved AppleScript dump is reused across restarts when the Contacts
+# databases can't be stat'ed to tell whether it's stale
+CONTACTS_SAVED_TTL = 3600
+
+# Pool of read-only connections shared by all tools, one per core since tools
+# run in worker threads and can query concurrently
+DB_POOL_SIZE = os.cpu_count() or 4
+_DB_POOL: queue.Queue = queue.Queue(maxsize=DB_POOL_SIZE)
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Unix timestamp of 2001-01-01 00:00:00 UTC, the epoch chat.db dates count from
+APPLE_EPOCH_OFFSET = 978307200
+
+# Columns returned for a chat unless the caller asks for others
+CHAT_COLUMNS = (
+    "ROWID",
+    "chat_identifier",
+    "display_name",
+    "service_name",
+    "room_name",
+    "last_read_message_timestamp",
+)
+
+# Handle ROWID -> phone number/email. The handle table is small and rarely
+# changes, so resolve senders in Python instead of joining it into every query.
+_HANDLES: dict[int, str] = {}
+
+# chat.db version _HANDLES was last reloaded at. Misses (e.g. messages pointing
+# at deleted handles) only reload the table again once chat.db has changed.
+_HANDLES_VERSION: tuple | None = None
+
+# Writable connection to the sidecar index database, guarded by _INDEX_LOCK
+_INDEX_CONN: sqlite3.Connection | None = None
+_INDEX_LOCK = threading.Lock()
+
+# Index name -> chat.db version it was last brought up to date with, so queries
+# skip the refresh entirely while chat.db is unchanged
+_INDEX_VERSIONS: dict[str, tuple] = {}
+
+# Seconds that whole-database aggregates are served from memory. chat.db changes
+# slowly, so slightly stale counts are fine for repeated stats lookups.
+STATS_TTL = 30
+
+# Seconds (and entries) that single-chat lookups are cached for while browsing
+LOOKUP_TTL = 300
+LOOKUP_CACHE_SIZE = 1024
+_TTL_CACHES: list[dict] = []
+
+# Seconds between planner statistics refreshes and deleted-message pruning on the
+# index database
+OPTIMIZE_INTERVAL = 900
+_OPTIMIZE_THREAD: threading.Thread | None = None
 
 
 def get_db_connection():
@@ -60,173 +180,726 @@ def get_db_connection():
     if not os.path.exists(IMESSAGES_DB_PATH):
         raise FileNotFoundError(f"iMessages database not found at {IMESSAGES_DB_PATH}")
     
-    # Connect with read-only mode
-    conn = sqlite3.connect(f"file:{IMESSAGES_DB_PATH}?mode=ro", uri=True)
-    conn.row_factory = sqlite3.Row
+    # Connect with read-only mode. Messages keeps chat.db in WAL mode, so readers
+    # proceed concurrently with the app writing new messages. Pooled connections
+    # live for the whole session, so keep every tool's compiled statements cached.
+    conn = sqlite3.connect(
+        f"file:{IMESSAGES_DB_PATH}?mode=ro&cache=private",
+        uri=True,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    
+    # Refuse writes even through ATTACHed databases, wait on a transient lock
+    # instead of failing with "database is locked", and keep hot pages in memory
+    # (64 MiB page cache, 256 MiB mmap)
+    conn.execute("PRAGMA query_only=1")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
     return conn
 
 
+@contextmanager
+def borrow_conn():
+    """Borrow a pooled connection, opening a new one if none are idle"""
+    try:
+        conn = _DB_POOL.get_nowait()
+    except queue.Empty:
+        conn = get_db_connection()
+    
+    try:
+        yield conn
+    finally:
+        # Return the connection for reuse, or close it if the pool is full
+        try:
+            _DB_POOL.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def close_pool():
+    """Close all idle pooled connections and the index connection"""
+    global _INDEX_CONN, _HANDLES_VERSION
+    
+    while True:
+        try:
+            conn = _DB_POOL.get_nowait()
+        except queue.Empty:
+            break
+        conn.close()
+    
+    _HANDLES.clear()
+    _HANDLES_VERSION = None
+    _count_chats.cache_clear()
+    for entries in _TTL_CACHES:
+        entries.clear()
+    
+    with _INDEX_LOCK:
+        if _INDEX_CONN is not None:
+            _INDEX_CONN.close()
+            _INDEX_CONN = None
+        _INDEX_VERSIONS.clear()
+
+
+# Close the pooled and index connections cleanly when the server exits
+atexit.register(close_pool)
+
+
+def _threaded(func):
+    """Run a blocking tool in a worker thread
+    
+    SQLite calls and AppleScript runs block, so running tools directly would
+    stall the event loop and serialize every request. Each call borrows its
+    own pooled connection, so concurrent tools read chat.db in parallel.
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await anyio.to_thread.run_sync(lambda: func(*args, **kwargs))
+    
+    return wrapper
+
+
+def _cache_key(args: tuple, kwargs: dict) -> tuple:
+    """Build a hashable cache key from call arguments, keying lists by their contents"""
+    def freeze(value):
+        return tuple(value) if isinstance(value, list) else value
+    
+    return (
+        tuple(freeze(value) for value in args),
+        tuple((name, freeze(value)) for name, value in sorted(kwargs.items())),
+    )
+
+
+def _ttl_cache(ttl: float, maxsize: int | None = None):
+    """Cache a function's results per arguments for `ttl` seconds
+    
+    With `maxsize`, the least recently stored entry is dropped once the cache is full.
+    """
+    def decorator(func):
+        cache: dict[tuple, tuple] = {}
+        lock = threading.Lock()
+        _TTL_CACHES.append(cache)
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _cache_key(args, kwargs)
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+            
+            result = func(*args, **kwargs)
+            # Tools run in worker threads, so guard the store and eviction
+            with lock:
+                cache.pop(key, None)
+                cache[key] = (now + ttl, result)
+                if maxsize is not None and len(cache) > maxsize:
+                    del cache[next(iter(cache))]
+            return result
+        
+        return wrapper
+    return decorator
+
+
+def _get_index_conn() -> sqlite3.Connection:
+    """Open the sidecar index database, with chat.db attached read-only as `src`"""
+    global _INDEX_CONN
+    
+    if _INDEX_CONN is None:
+        Path(IMESSAGES_INDEX_PATH).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            f"file:{IMESSAGES_INDEX_PATH}", uri=True, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS index_state (name TEXT PRIMARY KEY, last_rowid INTEGER NOT NULL, "
+            "message_count INTEGER NOT NULL DEFAULT 0)"
+        )
+        # Sidecars written before deletions were tracked lack the message count
+        if not any(row[1] == "message_count" for row in conn.execute("PRAGMA table_info(index_state)")):
+            conn.execute("ALTER TABLE index_state ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0")
+        conn.execute("ATTACH DATABASE ? AS src", (f"file:{IMESSAGES_DB_PATH}?mode=ro",))
+        # Recommended for long-lived connections: analyze anything that needs it now
+        conn.execute("PRAGMA main.optimize=0x10002")
+        _INDEX_CONN = conn
+        _start_optimizer()
+    return _INDEX_CONN
+
+
+def optimize_index() -> bool:
+    """Run PRAGMA optimize on the sidecar index database
+    
+    Only the sidecar is optimized: chat.db is opened read-only, and the
+    statistics gathered by ANALYZE can't be stored in it.
+    """
+    with _INDEX_LOCK:
+        if _INDEX_CONN is None:
+            return False
+        try:
+            _INDEX_CONN.execute("PRAGMA main.optimize")
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"PRAGMA optimize failed: {e}")
+            return False
+
+
+def _start_optimizer():
+    """Start the background thread that periodically runs optimize_index() and prune_indexes()"""
+    global _OPTIMIZE_THREAD
+    
+    if _OPTIMIZE_THREAD is not None:
+        return
+    
+    def run():
+        while True:
+            time.sleep(OPTIMIZE_INTERVAL)
+            optimize_index()
+            prune_indexes()
+    
+    _OPTIMIZE_THREAD = threading.Thread(target=run, name="imessage-optimize", daemon=True)
+    _OPTIMIZE_THREAD.start()
+
+
+def _attach_index(conn: sqlite3.Connection):
+    """Attach the sidecar index database read-only as `idx`, if not already attached"""
+    if not any(row[1] == "idx" for row in conn.execute("PRAGMA database_list")):
+        conn.execute("ATTACH DATABASE ? AS idx", (f"file:{IMESSAGES_INDEX_PATH}?mode=ro",))
+
+
+def _refresh_index(name: str, schema: str, insert: str) -> bool:
+    """Create a sidecar index table if needed and add chat.db rows past its watermark
+    
+    `insert` copies the message ROWID range given by its two parameters from
+    chat.db (attached as `src`). Deleted messages are dropped separately, by
+    prune_indexes(). Returns False if the index is unavailable (e.g. the
+    sidecar database can't be written), in which case callers fall back to
+    querying chat.db directly.
+    """
+    if not os.path.exists(IMESSAGES_DB_PATH):
+        raise FileNotFoundError(f"iMessages database not found at {IMESSAGES_DB_PATH}")
+    version = _chat_db_version()
+    
+    with _INDEX_LOCK:
+        try:
+            conn = _get_index_conn()
+            conn.execute(schema)
+            if _INDEX_VERSIONS.get(name) == version:
+                return True
+            
+            # Index only rows past the watermark left by the previous refresh
+            row = conn.execute(
+                "SELECT last_rowid, message_count FROM index_state WHERE name = ?", (name,)
+            ).fetchone()
+            last_rowid, message_count = row if row else (0, 0)
+            max_rowid = conn.execute("SELECT IFNULL(MAX(ROWID), 0) FROM src.message").fetchone()[0]
+            if max_rowid > last_rowid:
+                with conn:
+                    conn.execute(insert, (last_rowid, max_rowid))
+                    added = conn.execute(
+                        "SELECT COUNT(*) FROM src.message WHERE ROWID > ? AND ROWID <= ?",
+                        (last_rowid, max_rowid),
+                    ).fetchone()[0]
+                    conn.execute(
+                        "INSERT OR REPLACE INTO index_state (name, last_rowid, message_count) "
+                        "VALUES (?, ?, ?)",
+                        (name, max_rowid, message_count + added),
+                    )
+            _INDEX_VERSIONS[name] = version
+            return True
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Index {name!r} unavailable: {e}")
+            return False
+
+
+def refresh_search_index() -> bool:
+    """Add messages written since the last refresh to the full-text search index"""
+    return _refresh_index(
+        "msg_fts",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS msg_fts USING fts5("
+        "text, content='', tokenize='unicode61 remove_diacritics 2')",
+        """
+        INSERT INTO msg_fts (rowid, text)
+        SELECT ROWID, text FROM src.message
+        WHERE ROWID > ? AND ROWID <= ? AND text IS NOT NULL
+        """,
+    )
+
+
+def refresh_chat_index() -> bool:
+    """Bring the per-chat message index up to date with chat.db
+    
+    msg_by_chat_date is a covering index of (chat_id, date, message_id), so
+    per-chat queries become a range scan instead of a join plus sort.
+    """
+    return _refresh_index(
+        "msg_by_chat_date",
+        """
+        CREATE TABLE IF NOT EXISTS msg_by_chat_date (
+            chat_id INTEGER NOT NULL,
+            date INTEGER NOT NULL,
+            message_id INTEGER NOT NULL,
+            PRIMARY KEY (chat_id, date, message_id)
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT OR IGNORE INTO msg_by_chat_date (chat_id, date, message_id)
+        SELECT cmj.chat_id, m.date, cmj.message_id
+        FROM src.chat_message_join cmj
+        JOIN src.message m ON m.ROWID = cmj.message_id
+        WHERE cmj.message_id > ? AND cmj.message_id <= ?
+        """,
+    )
+
+
+# Statements dropping index rows whose messages are gone from chat.db, run by
+# prune_indexes(). msg_fts is contentless, so its entries can't be removed;
+# searches join message, which drops them from results.
+_INDEX_PRUNES = {
+    "msg_by_chat_date": """
+    DELETE FROM msg_by_chat_date
+    WHERE NOT EXISTS (
+        SELECT 1 FROM src.chat_message_join cmj
+        JOIN src.message m ON m.ROWID = cmj.message_id
+        WHERE cmj.chat_id = msg_by_chat_date.chat_id
+          AND cmj.message_id = msg_by_chat_date.message_id
+    )
+    """,
+}
+
+
+def prune_indexes() -> bool:
+    """Drop sidecar index rows for messages deleted from chat.db
+    
+    The watermarks only move forward, so deletions are caught by counting the
+    chat.db messages at or below each index's watermark: fewer than were
+    indexed means some are gone. That count scans the whole message table, so
+    it's taken once, on a pooled connection outside _INDEX_LOCK, and this runs
+    from the warm-up and optimizer threads rather than on the request path.
+    """
+    try:
+        with _INDEX_LOCK:
+            if _INDEX_CONN is None:
+                return False
+            state = _INDEX_CONN.execute("SELECT last_rowid FROM index_state").fetchall()
+        if not state:
+            return True
+        
+        watermark = min(last_rowid for (last_rowid,) in state)
+        with borrow_conn() as conn:
+            kept_below = conn.execute(
+                "SELECT COUNT(*) FROM message WHERE ROWID <= ?", (watermark,)
+            ).fetchone()[0]
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Index pruning skipped: {e}")
+        return False
+    
+    with _INDEX_LOCK:
+        if _INDEX_CONN is None:
+            return False
+        conn = _INDEX_CONN
+        try:
+            with conn:
+                for name, last_rowid, message_count in conn.execute(
+                    "SELECT name, last_rowid, message_count FROM index_state"
+                ).fetchall():
+                    # Add the short range between the shared count and this
+                    # index's watermark, which refreshes may have moved since
+                    kept = kept_below + conn.execute(
+                        "SELECT COUNT(*) FROM src.message WHERE ROWID > ? AND ROWID <= ?",
+                        (watermark, last_rowid),
+                    ).fetchone()[0]
+                    if kept < message_count and name in _INDEX_PRUNES:
+                        conn.execute(_INDEX_PRUNES[name])
+                    if kept != message_count:
+                        conn.execute(
+                            "UPDATE index_state SET message_count = ? WHERE name = ?",
+                            (kept, name),
+                        )
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Index pruning failed: {e}")
+            return False
+
+
+def warm_indexes():
+    """Bring the sidecar indexes up to date so the first search doesn't pay for the backfill"""
+    try:
+        refresh_search_index()
+        refresh_chat_index()
+        prune_indexes()
+    except FileNotFoundError as e:
+        logger.warning(f"Skipping index warm-up: {e}")
+
+
+def _chat_db_version() -> tuple:
+    """Identify the current contents of chat.db by the mtimes of it and its WAL"""
+    wal = f"{IMESSAGES_DB_PATH}-wal"
+    return (
+        IMESSAGES_DB_PATH,
+        os.stat(IMESSAGES_DB_PATH).st_mtime_ns,
+        os.stat(wal).st_mtime_ns if os.path.exists(wal) else 0,
+    )
+
+
+@lru_cache(maxsize=1)
+def _count_chats(db_version: tuple) -> int:
+    """Count chats, recounting only when chat.db has been written since the last call"""
+    with borrow_conn() as conn:
+        return conn.execute("SELECT COUNT(*) FROM chat").fetchone()[0]
+
+
+def _chat_columns(conn: sqlite3.Connection, columns: list[str] | None) -> str:
+    """Build the select list for a chat query, validating requested column names
+    
+    Defaults to CHAT_COLUMNS, leaving out wide columns such as the `properties`
+    blob. ROWID is always included.
+    """
+    if columns is None:
+        return ", ".join(CHAT_COLUMNS)
+    
+    known = {row[1] for row in conn.execute("PRAGMA table_info(chat)")}
+    unknown = [column for column in columns if column not in known]
+    if unknown:
+        raise ValueError(f"Unknown chat columns: {', '.join(unknown)}")
+    return ", ".join(["ROWID", *(column for column in columns if column != "ROWID")])
+
+
+def _chat_messages_table(conn: sqlite3.Connection) -> str:
+    """Return the (chat_id, date, message_id) relation to drive per-chat queries from
+    
+    Prefers the sidecar index; otherwise derives the same columns from chat.db.
+    """
+    if refresh_chat_index():
+        _attach_index(conn)
+        return "idx.msg_by_chat_date"
+    return """(
+            SELECT cmj.chat_id, m.date, cmj.message_id
+            FROM chat_message_join cmj
+            JOIN message m ON m.ROWID = cmj.message_id
+        )"""
+
+
+def _format_apple_date(apple_ns: int | None) -> str | None:
+    """Format a chat.db timestamp (nanoseconds since 2001-01-01 UTC) as local time"""
+    if apple_ns is None:
+        return None
+    # time.localtime applies the zone's DST rules for that instant without
+    # building a datetime object per row
+    return time.strftime(
+        "%Y-%m-%d %H:%M:%S", time.localtime(apple_ns // 1000000000 + APPLE_EPOCH_OFFSET)
+    )
+
+
+@lru_cache(maxsize=512)
+def _apple_epoch_ns(date: str) -> int:
+    """Convert an ISO date (or an Apple epoch timestamp string) to Apple epoch nanoseconds"""
+    if "-" in date:
+        dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
+        return int((dt.timestamp() - APPLE_EPOCH_OFFSET) * 1000000000)
+    return int(date)
+
+
+def _iter_rows(cursor: sqlite3.Cursor, batch_size: int = 256):
+    """Yield result rows as dicts, fetching them from SQLite in batches"""
+    # Column names are taken once per query rather than rebuilt for every row
+    columns = [column[0] for column in cursor.description]
+    while rows := cursor.fetchmany(batch_size):
+        for row in rows:
+            yield dict(zip(columns, row))
+
+
+def _fetch_dict(cursor: sqlite3.Cursor) -> dict | None:
+    """Return the next result row as a dict, or None when there are no more rows"""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([column[0] for column in cursor.description], row))
+
+
+def _reload_handles(conn: sqlite3.Connection) -> bool:
+    """Reload the handle map, unless chat.db is unchanged since the last reload"""
+    global _HANDLES_VERSION
+    
+    version = _chat_db_version()
+    if version == _HANDLES_VERSION:
+        return False
+    _HANDLES.update((row[0], row[1]) for row in conn.execute("SELECT ROWID, id FROM handle"))
+    _HANDLES_VERSION = version
+    return True
+
+
+def _resolve_handle(conn: sqlite3.Connection, handle_id: int | None) -> str | None:
+    """Map a handle ROWID to its phone number or email, reloading the handle table on a miss"""
+    if not handle_id:
+        return None
+    if handle_id not in _HANDLES:
+        _reload_handles(conn)
+    return _HANDLES.get(handle_id)
+
+
+def _match_handles(conn: sqlite3.Connection, contact: str) -> list[int]:
+    """Find the ROWIDs of handles whose phone number or email contains `contact`
+    
+    Input that looks like a phone number is compared by digits, so
+    "(555) 123-4567" matches the stored "+15551234567". Matches against the in-memory handle map, reloading
+    it if nothing matches and chat.db has changed, in case the handle is new.
+    """
+    needle = contact.strip().lower()
+    digits = normalize_phone(needle) if _PHONE_LIKE.fullmatch(needle) else ""
+    if not needle:
+        return []
+    
+    def find() -> list[int]:
+        return [
+            rowid
+            for rowid, handle in list(_HANDLES.items())
+            if needle in handle.lower() or (digits and digits in normalize_phone(handle))
+        ]
+    
+    matches = find()
+    if not matches and _reload_handles(conn):
+        matches = find()
+    return matches
+
+
+def _iter_messages(conn: sqlite3.Connection, cursor: sqlite3.Cursor):
+    """Yield message rows with their handle_id resolved to sender_id/sender_name"""
+    for row in _iter_rows(cursor):
+        row["date"] = _format_apple_date(row["date"])
+        sender = _resolve_handle(conn, row.pop("handle_id"))
+        row["sender_id"] = sender
+        row["sender_name"] = sender
+        yield row
+
+
+def _encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor: str, size: int) -> list:
+    """Decode a cursor produced by _encode_cursor from `size` integer sort key values"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        values = None
+    # Cursors come back from clients, so check the shape before it's unpacked
+    if not (
+        isinstance(values, list)
+        and len(values) == size
+        and all(type(value) is int for value in values)
+    ):
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}")
+    return values
+
+
 @mcp.tool
+@_threaded
 def get_recent_messages(limit: int = 20) -> list[dict]:
     """Get the most recent messages from iMessages"""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
+    with borrow_conn() as conn:
+        # Have SQLite build the whole result as one JSON array, so we decode a
+        # single string instead of constructing a dict per row. The handle join
+        # only touches the `limit` rows picked by the subquery, which is scanned
+        # in date order as the outer loop.
         query = """
-        SELECT 
-            m.guid,
-            m.text,
-            m.is_from_me,
-            datetime(m.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date,
-            h.id as contact
-        FROM message m
+        SELECT json_group_array(json_object(
+            'guid', m.guid,
+            'text', m.text,
+            'is_from_me', json(CASE WHEN m.is_from_me THEN 'true' ELSE 'false' END),
+            'date', datetime(m.date/1000000000 + 978307200, 'unixepoch', 'localtime'),
+            'contact', h.id
+        ))
+        FROM (
+            SELECT guid, text, is_from_me, date, handle_id
+            FROM message
+            WHERE text IS NOT NULL
+            ORDER BY date DESC
+            LIMIT ?
+        ) m
         LEFT JOIN handle h ON m.handle_id = h.ROWID
-        WHERE m.text IS NOT NULL
-        ORDER BY m.date DESC
-        LIMIT ?
         """
-        cursor.execute(query, (limit,))
-        messages = []
-        for row in cursor.fetchall():
-            messages.append({
-                "guid": row["guid"],
-                "text": row["text"],
-                "is_from_me": bool(row["is_from_me"]),
-                "date": row["date"],
-                "contact": row["contact"]
-            })
-        return messages
-    finally:
-        conn.close()
+        return json.loads(conn.execute(query, (limit,)).fetchone()[0])
+
+
+# A letter or digit: the only characters the unicode61 tokenizer indexes
+_FTS_TOKEN_CHAR = re.compile(r"[^\W_]")
 
 
 @mcp.tool
+@_threaded
 def search_messages(search_term: str, limit: int = 50) -> list[dict]:
-    """Search for messages containing specific text"""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        query = """
-        SELECT 
-            m.guid,
-            m.text,
-            m.is_from_me,
-            datetime(m.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date,
-            h.id as contact
-        FROM message m
-        LEFT JOIN handle h ON m.handle_id = h.ROWID
-        WHERE m.text LIKE ?
-        ORDER BY m.date DESC
-        LIMIT ?
-        """
-        cursor.execute(query, (f"%{search_term}%", limit))
-        messages = []
-        for row in cursor.fetchall():
-            messages.append({
-                "guid": row["guid"],
-                "text": row["text"],
-                "is_from_me": bool(row["is_from_me"]),
-                "date": row["date"],
-                "contact": row["contact"]
-            })
-        return messages
-    finally:
-        conn.close()
+    """Search for messages containing specific words
+    
+    The term is looked up in a full-text index by whole words, with the last
+    word matched as a prefix ("lunch aft" finds "lunch after"). When the index
+    finds nothing - e.g. for punctuation, part of a word, or a message edited
+    since it was indexed - messages are scanned for the term as a substring.
+    """
+    # Terms without a letter or digit have no tokens, so the index can't match them
+    use_index = bool(_FTS_TOKEN_CHAR.search(search_term)) and refresh_search_index()
+    
+    with borrow_conn() as conn:
+        rows = []
+        if use_index:
+            # Look the term up in the FTS5 index instead of scanning every message
+            _attach_index(conn)
+            query = """
+            SELECT 
+                m.guid,
+                m.text,
+                m.is_from_me,
+                m.date,
+                m.handle_id
+            FROM idx.msg_fts
+            JOIN message m ON m.ROWID = msg_fts.rowid
+            WHERE msg_fts MATCH ?
+            ORDER BY m.date DESC
+            LIMIT ?
+            """
+            # Quote the term as a single phrase so FTS5 query syntax in user input is inert
+            phrase = '"' + search_term.replace('"', '""') + '"*'
+            rows = conn.execute(query, (phrase, limit)).fetchall()
+        
+        if not rows:
+            query = """
+            SELECT 
+                m.guid,
+                m.text,
+                m.is_from_me,
+                m.date,
+                m.handle_id
+            FROM message m
+            WHERE m.text LIKE ?
+            ORDER BY m.date DESC
+            LIMIT ?
+            """
+            rows = conn.execute(query, (f"%{search_term}%", limit)).fetchall()
+        
+        return [
+            {
+                "guid": guid,
+                "text": text,
+                "is_from_me": bool(is_from_me),
+                "date": _format_apple_date(date),
+                "contact": _resolve_handle(conn, handle_id),
+            }
+            for guid, text, is_from_me, date, handle_id in rows
+        ]
 
 
 @mcp.tool
+@_threaded
 def get_messages_from_contact(contact: str, limit: int = 50) -> list[dict]:
     """Get messages from a specific contact (phone number or email)"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
+        # Resolve the contact to handle ROWIDs in Python, then seek messages by
+        # handle_id instead of scanning handle with a LIKE '%...%' join
+        handle_ids = _match_handles(conn, contact)
+        if not handle_ids:
+            return []
+        
         query = """
         SELECT 
             m.guid,
             m.text,
             m.is_from_me,
-            datetime(m.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date,
-            h.id as contact
+            m.date,
+            m.handle_id
         FROM message m
-        LEFT JOIN handle h ON m.handle_id = h.ROWID
-        WHERE h.id LIKE ? AND m.text IS NOT NULL
+        WHERE m.handle_id IN (SELECT value FROM json_each(?)) AND m.text IS NOT NULL
         ORDER BY m.date DESC
         LIMIT ?
         """
-        cursor.execute(query, (f"%{contact}%", limit))
-        messages = []
-        for row in cursor.fetchall():
-            messages.append({
-                "guid": row["guid"],
-                "text": row["text"],
-                "is_from_me": bool(row["is_from_me"]),
-                "date": row["date"],
-                "contact": row["contact"]
-            })
-        return messages
-    finally:
-        conn.close()
+        cursor.execute(query, (json.dumps(handle_ids), limit))
+        return [
+            {
+                "guid": guid,
+                "text": text,
+                "is_from_me": bool(is_from_me),
+                "date": _format_apple_date(date),
+                "contact": _resolve_handle(conn, handle_id),
+            }
+            for guid, text, is_from_me, date, handle_id in cursor
+        ]
 
 
 @mcp.tool
+@_threaded
 def get_conversation_list(limit: int = 20) -> list[dict]:
     """Get a list of recent conversations with contact names and last message"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        query = """
+        chat_messages = _chat_messages_table(conn)
+        # One grouped pass over (chat_id, date, message_id) for each chat's count and
+        # latest date, then one probe at the end of the chat's range for its last
+        # message. The probe breaks date ties on the newest message_id, as
+        # get_last_message_id_from_chat does; a bare column beside MAX(date) would
+        # take the first of the tied rows. Left-joined so a chat stays listed if
+        # that message was deleted since the index was last pruned.
+        query = f"""
+        WITH last AS (
+            SELECT 
+                cm.chat_id,
+                MAX(cm.date) as date,
+                COUNT(*) as message_count
+            FROM {chat_messages} cm
+            GROUP BY cm.chat_id
+        )
         SELECT 
             c.chat_identifier,
             c.display_name,
-            MAX(m.date) as last_message_date,
-            COUNT(m.ROWID) as message_count,
-            (SELECT text FROM message WHERE handle_id = h.ROWID ORDER BY date DESC LIMIT 1) as last_message
-        FROM chat c
-        JOIN chat_message_join cmj ON c.ROWID = cmj.chat_id
-        JOIN message m ON cmj.message_id = m.ROWID
-        LEFT JOIN chat_handle_join chj ON c.ROWID = chj.chat_id
-        LEFT JOIN handle h ON chj.handle_id = h.ROWID
-        GROUP BY c.ROWID
-        ORDER BY last_message_date DESC
+            last.date as last_message_date,
+            last.message_count,
+            m.text as last_message
+        FROM last
+        JOIN chat c ON c.ROWID = last.chat_id
+        LEFT JOIN message m ON m.ROWID = (
+            SELECT cm.message_id
+            FROM {chat_messages} cm
+            WHERE cm.chat_id = last.chat_id
+            ORDER BY cm.date DESC, cm.message_id DESC
+            LIMIT 1
+        )
+        ORDER BY last.date DESC
         LIMIT ?
         """
         cursor.execute(query, (limit,))
-        conversations = []
-        for row in cursor.fetchall():
-            conversations.append({
-                "chat_id": row["chat_identifier"],
-                "display_name": row["display_name"] or row["chat_identifier"],
-                "last_message_date": datetime.fromtimestamp(row["last_message_date"]/1000000000 + 978307200).isoformat() if row["last_message_date"] else None,
-                "message_count": row["message_count"],
-                "last_message": row["last_message"]
-            })
-        return conversations
-    finally:
-        conn.close()
+        return [
+            {
+                "chat_id": chat_identifier,
+                "display_name": display_name or chat_identifier,
+                "last_message_date": _format_apple_date(last_message_date),
+                "message_count": message_count,
+                "last_message": last_message,
+            }
+            for chat_identifier, display_name, last_message_date, message_count, last_message
+            in cursor
+        ]
 
 
 @mcp.tool
+@_threaded
+@_ttl_cache(STATS_TTL)
 def get_message_stats() -> dict:
     """Get statistics about the messages database"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
         
-        # Total messages
-        cursor.execute("SELECT COUNT(*) as total FROM message WHERE text IS NOT NULL")
-        total_messages = cursor.fetchone()["total"]
-        
-        # Messages sent vs received
-        cursor.execute("SELECT COUNT(*) as sent FROM message WHERE is_from_me = 1 AND text IS NOT NULL")
-        sent_messages = cursor.fetchone()["sent"]
-        
-        # Total unique contacts
-        cursor.execute("SELECT COUNT(DISTINCT handle_id) as contacts FROM message")
-        total_contacts = cursor.fetchone()["contacts"]
-        
-        # Total conversations
-        cursor.execute("SELECT COUNT(*) as chats FROM chat")
-        total_chats = cursor.fetchone()["chats"]
+        # Total, sent, and unique contacts in a single scan of the message table,
+        # with the conversation count folded into the same statement
+        cursor.execute("""
+        SELECT 
+            COUNT(text) as total,
+            COUNT(CASE WHEN is_from_me = 1 AND text IS NOT NULL THEN 1 END) as sent,
+            COUNT(DISTINCT handle_id) as contacts,
+            (SELECT COUNT(*) FROM chat) as chats
+        FROM message
+        """)
+        total_messages, sent_messages, total_contacts, total_chats = cursor.fetchone()
         
         return {
             "total_messages": total_messages,
@@ -235,324 +908,335 @@ def get_message_stats() -> dict:
             "total_contacts": total_contacts,
             "total_conversations": total_chats
         }
-    finally:
-        conn.close()
 
 
 @mcp.tool
+@_threaded
 def get_message(message_id: int) -> dict:
     """Get a specific message by its ID"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
         query = """
         SELECT 
             message.ROWID as id,
             message.text,
             message.attributedBody,
-            datetime(message.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date,
+            message.date,
             message.is_from_me,
-            handle.id as sender_id,
-            handle.id as sender_name
+            message.handle_id
         FROM message 
         JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
-        JOIN chat ON chat.ROWID = chat_message_join.chat_id
-        LEFT JOIN handle ON message.handle_id = handle.ROWID
         WHERE message.ROWID = ?
         """
         cursor.execute(query, (message_id,))
-        row = cursor.fetchone()
-        if row:
-            return dict(row)
+        for message in _iter_messages(conn, cursor):
+            return message
         return None
-    finally:
-        conn.close()
 
 
 @mcp.tool
+@_threaded
 def get_message_count(chat_id: str) -> int:
     """Get the total number of messages in a chat"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
+        # A range count on chat_message_join's (chat_id, message_id) key; no need
+        # to touch message or refresh the sidecar index just to count
         query = """
         SELECT COUNT(*) as count
-        FROM message 
-        JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
-        WHERE chat_message_join.chat_id = ?
+        FROM chat_message_join
+        WHERE chat_id = ?
         """
         cursor.execute(query, (chat_id,))
-        return cursor.fetchone()["count"]
-    finally:
-        conn.close()
+        return cursor.fetchone()[0]
 
 
 @mcp.tool
-def get_messages(chat_id: int, limit: int = 50, offset: int = 0, order: str = "DESC") -> list[dict]:
-    """Get messages from a specific chat with pagination"""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
+@_threaded
+def get_messages(chat_id: int, limit: int = 50, cursor: str | None = None, order: str = "DESC") -> dict:
+    """Get messages from a specific chat, one page at a time
+    
+    Args:
+        chat_id: The chat ROWID
+        limit: Maximum number of messages per page
+        cursor: The next_cursor returned by the previous page (omit for the first page)
+        order: "DESC" for newest first, "ASC" for oldest first
+    
+    Returns:
+        Dictionary with the page of messages and the cursor for the next page
+    """
+    # Only ever interpolate one of the two known directions, so the query text
+    # stays in a fixed set the statement cache can reuse (and can't be injected)
+    order = "ASC" if order.upper() == "ASC" else "DESC"
+    
+    # Seek past the previous page on (date, ROWID) rather than skipping rows with
+    # OFFSET, so every page costs the same regardless of how deep it is
+    comparison = ">" if order == "ASC" else "<"
+    keyset = ""
+    params: tuple = (chat_id, limit)
+    if cursor:
+        last_date, last_id = _decode_cursor(cursor, 2)
+        keyset = f"AND (cm.date {comparison} ? OR (cm.date = ? AND cm.message_id {comparison} ?))"
+        params = (chat_id, last_date, last_date, last_id, limit)
+    
+    with borrow_conn() as conn:
         query = f"""
         SELECT 
             message.ROWID as id,
             message.text,
             message.attributedBody,
-            datetime(message.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date,
+            cm.date,
             message.is_from_me,
-            handle.id as sender_id,
-            handle.id as sender_name
-        FROM message 
-        JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
-        JOIN chat ON chat.ROWID = chat_message_join.chat_id
-        LEFT JOIN handle ON message.handle_id = handle.ROWID
-        WHERE chat_message_join.chat_id = ?
-        ORDER BY message.date {order}
-        LIMIT ? OFFSET ?
+            message.handle_id,
+            cm.date as apple_date
+        FROM {_chat_messages_table(conn)} cm
+        JOIN message ON message.ROWID = cm.message_id
+        WHERE cm.chat_id = ?
+        {keyset}
+        ORDER BY cm.date {order}, cm.message_id {order}
+        LIMIT ?
         """
-        cursor.execute(query, (chat_id, limit, offset))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+        messages = list(_iter_messages(conn, conn.execute(query, params)))
+    
+    next_cursor = None
+    if messages and len(messages) == limit:
+        next_cursor = _encode_cursor(messages[-1]["apple_date"], messages[-1]["id"])
+    for message in messages:
+        del message["apple_date"]
+    
+    return {"messages": messages, "next_cursor": next_cursor}
 
 
 @mcp.tool
+@_threaded
+def get_messages_batch(chat_ids: list[int], limit: int = 20) -> dict[str, list[dict]]:
+    """Get the most recent messages from several chats in a single query
+    
+    Args:
+        chat_ids: The chat ROWIDs to fetch messages for
+        limit: Maximum number of messages per chat, newest first
+    
+    Returns:
+        Dictionary mapping each chat ID to its messages
+    """
+    batch: dict[str, list[dict]] = {str(chat_id): [] for chat_id in chat_ids}
+    if not chat_ids:
+        return batch
+    
+    with borrow_conn() as conn:
+        # Rank messages within each chat on the index columns alone, then fetch
+        # payloads only for the rows that make the cut. The chat IDs are passed
+        # as one JSON array so the SQL text (and its cached statement) is the
+        # same however many chats are requested.
+        query = f"""
+        WITH ranked AS (
+            SELECT 
+                cm.chat_id,
+                cm.date,
+                cm.message_id,
+                ROW_NUMBER() OVER (PARTITION BY cm.chat_id ORDER BY cm.date DESC, cm.message_id DESC) as rn
+            FROM {_chat_messages_table(conn)} cm
+            WHERE cm.chat_id IN (SELECT value FROM json_each(?))
+        )
+        SELECT 
+            ranked.chat_id,
+            message.ROWID as id,
+            message.text,
+            message.attributedBody,
+            ranked.date,
+            message.is_from_me,
+            message.handle_id
+        FROM ranked
+        JOIN message ON message.ROWID = ranked.message_id
+        WHERE ranked.rn <= ?
+        ORDER BY ranked.chat_id, ranked.rn
+        """
+        for row in _iter_messages(conn, conn.execute(query, (json.dumps(chat_ids), limit))):
+            batch[str(row.pop("chat_id"))].append(row)
+    
+    return batch
+
+
+@mcp.tool
+@_threaded
 def get_messages_before(chat_id: int, message_id: int, limit: int = 50) -> list[dict]:
     """Get messages from a chat before a specific message ID"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        query = """
+        query = f"""
         SELECT 
             message.ROWID as id,
             message.text,
             message.attributedBody,
-            datetime(message.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date,
+            cm.date,
             message.is_from_me,
-            handle.id as sender_id,
-            handle.id as sender_name
-        FROM message 
-        JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
-        JOIN chat ON chat.ROWID = chat_message_join.chat_id
-        LEFT JOIN handle ON message.handle_id = handle.ROWID
-        WHERE chat_message_join.chat_id = ?
-        AND message.ROWID < ?
-        ORDER BY message.date ASC
+            message.handle_id
+        FROM {_chat_messages_table(conn)} cm
+        JOIN message ON message.ROWID = cm.message_id
+        WHERE cm.chat_id = ?
+        AND cm.message_id < ?
+        ORDER BY cm.date ASC
         LIMIT ?
         """
         cursor.execute(query, (chat_id, message_id, limit))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+        return list(_iter_messages(conn, cursor))
 
 
 @mcp.tool
+@_threaded
 def get_messages_after_id(chat_id: int, message_id: int, limit: int = 50) -> list[dict]:
     """Get messages from a chat after a specific message ID"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        query = """
+        query = f"""
         SELECT 
             message.ROWID as id,
             message.text,
             message.attributedBody,
-            datetime(message.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date,
+            cm.date,
             message.is_from_me,
-            handle.id as sender_id,
-            handle.id as sender_name
-        FROM message 
-        JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
-        JOIN chat ON chat.ROWID = chat_message_join.chat_id
-        LEFT JOIN handle ON message.handle_id = handle.ROWID
-        WHERE chat_message_join.chat_id = ?
-        AND message.ROWID > ?
-        ORDER BY message.date ASC
+            message.handle_id
+        FROM {_chat_messages_table(conn)} cm
+        JOIN message ON message.ROWID = cm.message_id
+        WHERE cm.chat_id = ?
+        AND cm.message_id > ?
+        ORDER BY cm.date ASC
         LIMIT ?
         """
         cursor.execute(query, (chat_id, message_id, limit))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+        return list(_iter_messages(conn, cursor))
 
 
 @mcp.tool
+@_threaded
 def get_messages_before_date(chat_id: int, date: str, limit: int = 50) -> list[dict]:
     """Get messages from a chat before a specific date (Apple epoch timestamp)"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        # Convert ISO date to Apple epoch if needed
-        if isinstance(date, str) and "-" in date:
-            # Convert from ISO format to Apple epoch
-            from datetime import datetime
-            dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
-            apple_epoch = int((dt.timestamp() - 978307200) * 1000000000)
-        else:
-            apple_epoch = int(date)
+        apple_epoch = _apple_epoch_ns(date)
         
-        query = """
+        query = f"""
         SELECT 
             message.ROWID as id,
             message.text,
             message.attributedBody,
-            datetime(message.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date,
+            cm.date,
             message.is_from_me,
-            handle.id as sender_id,
-            handle.id as sender_name
-        FROM message 
-        JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
-        JOIN chat ON chat.ROWID = chat_message_join.chat_id
-        LEFT JOIN handle ON message.handle_id = handle.ROWID
-        WHERE chat_message_join.chat_id = ?
-        AND message.date < ?
-        ORDER BY message.date DESC
+            message.handle_id
+        FROM {_chat_messages_table(conn)} cm
+        JOIN message ON message.ROWID = cm.message_id
+        WHERE cm.chat_id = ?
+        AND cm.date < ?
+        ORDER BY cm.date DESC, cm.message_id DESC
         LIMIT ?
         """
         cursor.execute(query, (chat_id, apple_epoch, limit))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+        return list(_iter_messages(conn, cursor))
 
 
 @mcp.tool
+@_threaded
 def get_messages_after_date(chat_id: int, date: str, limit: int = 50) -> list[dict]:
     """Get messages from a chat after a specific date (Apple epoch timestamp)"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        # Convert ISO date to Apple epoch if needed
-        if isinstance(date, str) and "-" in date:
-            # Convert from ISO format to Apple epoch
-            from datetime import datetime
-            dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
-            apple_epoch = int((dt.timestamp() - 978307200) * 1000000000)
-        else:
-            apple_epoch = int(date)
+        apple_epoch = _apple_epoch_ns(date)
         
-        query = """
+        query = f"""
         SELECT 
             message.ROWID as id,
             message.text,
             message.attributedBody,
-            datetime(message.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date,
+            cm.date,
             message.is_from_me,
-            handle.id as sender_id,
-            handle.id as sender_name
-        FROM message 
-        JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
-        JOIN chat ON chat.ROWID = chat_message_join.chat_id
-        LEFT JOIN handle ON message.handle_id = handle.ROWID
-        WHERE chat_message_join.chat_id = ?
-        AND message.date > ?
-        ORDER BY message.date ASC
+            message.handle_id
+        FROM {_chat_messages_table(conn)} cm
+        JOIN message ON message.ROWID = cm.message_id
+        WHERE cm.chat_id = ?
+        AND cm.date > ?
+        ORDER BY cm.date ASC, cm.message_id ASC
         LIMIT ?
         """
         cursor.execute(query, (chat_id, apple_epoch, limit))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+        return list(_iter_messages(conn, cursor))
 
 
 @mcp.tool
+@_threaded
 def get_messages_same_date(chat_id: int, date: str) -> list[dict]:
     """Get all messages from a chat on a specific date (Apple epoch timestamp)"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        # Convert ISO date to Apple epoch if needed
-        if isinstance(date, str) and "-" in date:
-            # Convert from ISO format to Apple epoch
-            from datetime import datetime
-            dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
-            apple_epoch = int((dt.timestamp() - 978307200) * 1000000000)
-        else:
-            apple_epoch = int(date)
+        apple_epoch = _apple_epoch_ns(date)
         
-        query = """
+        query = f"""
         SELECT 
             message.ROWID as id,
             message.text,
             message.attributedBody,
-            datetime(message.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date,
+            cm.date,
             message.is_from_me,
-            handle.id as sender_id,
-            handle.id as sender_name
-        FROM message 
-        JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
-        JOIN chat ON chat.ROWID = chat_message_join.chat_id
-        LEFT JOIN handle ON message.handle_id = handle.ROWID
-        WHERE chat_message_join.chat_id = ?
-          AND message.date = ?
-        ORDER BY message.ROWID ASC
+            message.handle_id
+        FROM {_chat_messages_table(conn)} cm
+        JOIN message ON message.ROWID = cm.message_id
+        WHERE cm.chat_id = ?
+          AND cm.date = ?
+        ORDER BY cm.message_id ASC
         """
         cursor.execute(query, (chat_id, apple_epoch))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+        return list(_iter_messages(conn, cursor))
 
 
 @mcp.tool
+@_threaded
 def get_unique_senders_since(date: str) -> int:
     """Get count of unique senders since a specific date (excluding yourself)"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        # Convert ISO date to Apple epoch if needed
-        if isinstance(date, str) and "-" in date:
-            # Convert from ISO format to Apple epoch
-            from datetime import datetime
-            dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
-            apple_epoch = int((dt.timestamp() - 978307200) * 1000000000)
-        else:
-            apple_epoch = int(date)
+        apple_epoch = _apple_epoch_ns(date)
         
         query = """
-        SELECT COUNT(DISTINCT handle.id) as count
+        SELECT DISTINCT handle_id
         FROM message
-        LEFT JOIN handle ON message.handle_id = handle.ROWID
-        WHERE message.is_from_me = 0 AND message.date >= ?
+        WHERE is_from_me = 0 AND date >= ?
         """
-        cursor.execute(query, (apple_epoch,))
-        return cursor.fetchone()["count"]
-    finally:
-        conn.close()
+        # Several handle rows (e.g. SMS and iMessage) can share one phone number/email
+        senders = {_resolve_handle(conn, row[0]) for row in cursor.execute(query, (apple_epoch,))}
+        senders.discard(None)
+        return len(senders)
 
 
 @mcp.tool
+@_threaded
 def get_distinct_senders_since(date: str) -> list[dict]:
     """Get distinct senders and their message counts since a specific date"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        # Convert ISO date to Apple epoch if needed
-        if isinstance(date, str) and "-" in date:
-            # Convert from ISO format to Apple epoch
-            from datetime import datetime
-            dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
-            apple_epoch = int((dt.timestamp() - 978307200) * 1000000000)
-        else:
-            apple_epoch = int(date)
+        apple_epoch = _apple_epoch_ns(date)
         
         query = """
-        SELECT handle.id as sender_id, COUNT(*) as messages
+        SELECT handle_id, COUNT(*) as messages
         FROM message
-        LEFT JOIN handle ON message.handle_id = handle.ROWID
-        WHERE message.is_from_me = 0 AND message.date >= ?
-        GROUP BY handle.id
-        ORDER BY messages DESC
+        WHERE is_from_me = 0 AND date >= ?
+        GROUP BY handle_id
         """
-        cursor.execute(query, (apple_epoch,))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+        # Several handle rows (e.g. SMS and iMessage) can share one phone number/email
+        counts: dict[str | None, int] = {}
+        for handle_id, messages in cursor.execute(query, (apple_epoch,)):
+            sender_id = _resolve_handle(conn, handle_id)
+            counts[sender_id] = counts.get(sender_id, 0) + messages
+        
+        return [
+            {"sender_id": sender_id, "messages": messages}
+            for sender_id, messages in sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        ]
 
 
 @mcp.tool
+@_threaded
 def get_chat_id_from_message(message_id: int) -> Optional[int]:
     """Get the chat ID associated with a specific message"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
         query = """
         SELECT 
@@ -563,143 +1247,161 @@ def get_chat_id_from_message(message_id: int) -> Optional[int]:
         """
         cursor.execute(query, (message_id,))
         row = cursor.fetchone()
-        return row["chatId"] if row else None
-    finally:
-        conn.close()
+        return row[0] if row else None
 
 
 @mcp.tool
+@_threaded
 def get_last_message_id_from_chat(chat_id: int) -> Optional[int]:
     """Get the ID of the last message in a chat"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        query = """
+        query = f"""
         SELECT 
             message.ROWID as lastMessageId
-        FROM message 
-        JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
-        WHERE chat_message_join.chat_id = ?
-        ORDER BY message.date DESC, message.ROWID DESC
+        FROM {_chat_messages_table(conn)} cm
+        JOIN message ON message.ROWID = cm.message_id
+        WHERE cm.chat_id = ?
+        ORDER BY cm.date DESC, cm.message_id DESC
         LIMIT 1
         """
         cursor.execute(query, (chat_id,))
         row = cursor.fetchone()
-        return row["lastMessageId"] if row else None
-    finally:
-        conn.close()
+        return row[0] if row else None
 
 
 @mcp.tool
+@_threaded
 def get_last_message_date_from_chat(chat_id: int) -> Optional[str]:
     """Get the date of the last message in a chat"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        query = """
-        SELECT 
-            datetime(message.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as lastMessageDate
-        FROM message 
-        JOIN chat_message_join ON chat_message_join.message_id = message.ROWID
-        WHERE chat_message_join.chat_id = ?
-        ORDER BY message.date DESC, message.ROWID DESC
-        LIMIT 1
+        # A single probe at the end of the chat's (chat_id, date) range
+        query = f"""
+        SELECT MAX(cm.date) as lastMessageDate
+        FROM {_chat_messages_table(conn)} cm
+        WHERE cm.chat_id = ?
         """
         cursor.execute(query, (chat_id,))
-        row = cursor.fetchone()
-        return row["lastMessageDate"] if row else None
-    finally:
-        conn.close()
+        return _format_apple_date(cursor.fetchone()[0])
 
 
 @mcp.tool
-def get_chat_names(limit: int = 50, offset: int = 0) -> list[dict]:
-    """Get a list of chats ordered by most recent"""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        query = """
-        SELECT *
+@_threaded
+def get_chat_names(
+    limit: int = 50, cursor: str | None = None, columns: list[str] | None = None
+) -> dict:
+    """Get a list of chats ordered by most recent, one page at a time
+    
+    Args:
+        limit: Maximum number of chats per page
+        cursor: The next_cursor returned by the previous page (omit for the first page)
+        columns: chat table columns to return (defaults to the commonly used ones)
+    
+    Returns:
+        Dictionary with the page of chats and the cursor for the next page
+    """
+    keyset = ""
+    params: tuple = (limit,)
+    if cursor:
+        (last_id,) = _decode_cursor(cursor, 1)
+        keyset = "WHERE ROWID < ?"
+        params = (last_id, limit)
+    
+    with borrow_conn() as conn:
+        query = f"""
+        SELECT {_chat_columns(conn, columns)}
         FROM chat
+        {keyset}
         ORDER BY ROWID DESC
-        LIMIT ? OFFSET ?
+        LIMIT ?
         """
-        cursor.execute(query, (limit, offset))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+        chats = list(_iter_rows(conn.execute(query, params)))
+    
+    next_cursor = None
+    if chats and len(chats) == limit:
+        next_cursor = _encode_cursor(chats[-1]["ROWID"])
+    
+    return {"chats": chats, "next_cursor": next_cursor}
 
 
 @mcp.tool
+@_threaded
 def get_total_chat_count() -> int:
     """Get the total number of chats"""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        query = """
-        SELECT COUNT(*) as total
-        FROM chat
-        """
-        cursor.execute(query)
-        return cursor.fetchone()["total"]
-    finally:
-        conn.close()
+    return _count_chats(_chat_db_version())
 
 
 @mcp.tool
+@_threaded
+@_ttl_cache(LOOKUP_TTL, maxsize=LOOKUP_CACHE_SIZE)
 def get_chat_participant_handles(chat_id: int) -> list[str]:
     """Get participant handles (phone numbers/emails) for a given chat"""
-    conn = get_db_connection()
-    try:
+    with borrow_conn() as conn:
         cursor = conn.cursor()
         query = """
-        SELECT h.id AS handle
-        FROM chat_handle_join chj
-        JOIN handle h ON h.ROWID = chj.handle_id
-        WHERE chj.chat_id = ?
+        SELECT handle_id
+        FROM chat_handle_join
+        WHERE chat_id = ?
         """
-        cursor.execute(query, (chat_id,))
-        return [row["handle"] for row in cursor.fetchall()]
-    finally:
-        conn.close()
+        # Skip participants whose handle row is gone, as joining handle would
+        handles = (_resolve_handle(conn, row[0]) for row in cursor.execute(query, (chat_id,)))
+        return [handle for handle in handles if handle is not None]
 
 
 @mcp.tool
-def get_chat_by_id(chat_id: int) -> Optional[dict]:
-    """Get a single chat by its ROWID"""
-    conn = get_db_connection()
-    try:
+@_threaded
+@_ttl_cache(LOOKUP_TTL, maxsize=LOOKUP_CACHE_SIZE)
+def get_chat_by_id(chat_id: int, columns: list[str] | None = None) -> dict | None:
+    """Get a single chat by its ROWID, optionally choosing which chat columns to return"""
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        query = """
-        SELECT * FROM chat WHERE ROWID = ?
+        query = f"""
+        SELECT {_chat_columns(conn, columns)} FROM chat WHERE ROWID = ?
         """
         cursor.execute(query, (chat_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
-    finally:
-        conn.close()
+        return _fetch_dict(cursor)
 
 
 @mcp.tool
-def get_chat_by_identifier(chat_identifier: str) -> Optional[dict]:
-    """Get a single chat by its chat_identifier"""
-    conn = get_db_connection()
-    try:
+@_threaded
+@_ttl_cache(LOOKUP_TTL, maxsize=LOOKUP_CACHE_SIZE)
+def get_chat_by_identifier(
+    chat_identifier: str, columns: list[str] | None = None
+) -> dict | None:
+    """Get a single chat by its chat_identifier, optionally choosing which chat columns to return"""
+    with borrow_conn() as conn:
         cursor = conn.cursor()
-        query = """
-        SELECT * FROM chat WHERE chat_identifier = ?
+        query = f"""
+        SELECT {_chat_columns(conn, columns)} FROM chat WHERE chat_identifier = ?
         """
         cursor.execute(query, (chat_identifier,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
-    finally:
-        conn.close()
+        return _fetch_dict(cursor)
+
+
+_NON_DIGITS = re.compile(r'\D')
+
+# Input that's a phone number (digits, "+", and the usual punctuation) rather than a name
+_PHONE_LIKE = re.compile(r'\+?[\d\s().-]*\d[\d\s().-]*')
+
+# Separators in the AppleScript contact dumps: ASCII record, unit and group
+# separators can't appear in names, numbers or addresses, unlike "|" and ";"
+RECORD_SEP = "\x1e"
+FIELD_SEP = "\x1f"
+ITEM_SEP = "\x1d"
+
+# One whole name/phones/emails/id record of the snapshot dump; malformed records
+# don't match. Walked with finditer so a multi-MB dump is never split into a list
+# of records up front
+_CONTACT_RECORD = re.compile(
+    r"(?:^|(?<=\x1e))([^\x1e\x1f]*)\x1f([^\x1e\x1f]*)\x1f([^\x1e\x1f]*)\x1f([^\x1e\x1f]*)(?=\x1e|$)"
+)
 
 
 def normalize_phone(phone: str) -> str:
     """Normalize a phone number to just digits for comparison"""
-    # Keep only digits
-    digits = ''.join(filter(str.isdigit, phone))
+    # Keep only digits (one C-level pass rather than a Python call per character)
+    digits = _NON_DIGITS.sub('', phone)
     
     # Handle common US phone formats
     if len(digits) == 10:  # Missing country code
@@ -710,143 +1412,300 @@ def normalize_phone(phone: str) -> str:
     return digits
 
 
-def load_contact_cache():
-    """Load all contacts into memory for fast lookups"""
-    global CONTACT_CACHE, CONTACT_PHONE_LOOKUP
-    
-    if CONTACT_CACHE is not None:
-        return  # Already loaded
+def _addressbook_databases() -> list[Path]:
+    """Find the Contacts (AddressBook) databases: the local store and one per account source"""
+    root = Path(ADDRESSBOOK_PATH)
+    databases = sorted(root.glob("Sources/*/AddressBook-v22.abcddb"))
+    if (root / "AddressBook-v22.abcddb").exists():
+        databases.append(root / "AddressBook-v22.abcddb")
+    if not databases:
+        raise FileNotFoundError(f"No Contacts databases found under {ADDRESSBOOK_PATH}")
+    return databases
+
+
+def _open_addressbook_db(database: Path) -> sqlite3.Connection:
+    """Open one of the Contacts stores read-only"""
+    return sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+
+
+def _addressbook_label(label: str | None) -> str:
+    """Turn a stored label like `_$!<Mobile>!$_` into the `mobile` that AppleScript reports"""
+    if label and label.startswith("_$!<") and label.endswith(">!$_"):
+        return label[4:-4].lower()
+    return label or ""
+
+
+# Display name as the Contacts app shows it: first and last name, else the organization
+_ADDRESSBOOK_NAME = """COALESCE(
+    NULLIF(TRIM(COALESCE(ZFIRSTNAME, '') || ' ' || COALESCE(ZLASTNAME, '')), ''),
+    ZORGANIZATION
+)"""
+
+
+def _add_addressbook_details(
+    conn: sqlite3.Connection, people: dict[int, dict[str, Any]], owners: str | None = None
+):
+    """Fill in the labelled phones and emails of `people`, keyed by record Z_PK
+    
+    `owners` (a JSON list of Z_PKs) limits the lookup to those records;
+    without it every number and address in the store is read in one pass.
+    """
+    for table, column, key in (
+        ("ZABCDPHONENUMBER", "ZFULLNUMBER", "phones"),
+        ("ZABCDEMAILADDRESS", "ZADDRESS", "emails"),
+    ):
+        query = f"SELECT ZOWNER, ZLABEL, {column} FROM {table} WHERE {column} != ''"
+        params: tuple = ()
+        if owners is not None:
+            query += " AND ZOWNER IN (SELECT value FROM json_each(?))"
+            params = (owners,)
+        for owner, label, value in conn.execute(query + " ORDER BY Z_PK", params):
+            person = people.get(owner)
+            if person is not None:
+                label = _addressbook_label(label)
+                person[key].append(f"{label}: {value}" if label else value)
+
+
+def _read_addressbook_snapshot() -> list[dict[str, Any]]:
+    """Read every contact's name, labelled phones and emails, and id from the Contacts stores
+    
+    Ids are the records' unique ids, the same ones AppleScript reports, so
+    pagination cursors carry over between the two sources.
+    """
+    contacts: list[dict[str, Any]] = []
+    for database in _addressbook_databases():
+        conn = _open_addressbook_db(database)
+        try:
+            people = {
+                pk: {"id": unique_id, "name": person_name, "phones": [], "emails": []}
+                for pk, unique_id, person_name in conn.execute(
+                    f"SELECT Z_PK, COALESCE(ZUNIQUEID, CAST(Z_PK AS TEXT)), {_ADDRESSBOOK_NAME} AS name "
+                    "FROM ZABCDRECORD WHERE name IS NOT NULL"
+                )
+            }
+            _add_addressbook_details(conn, people)
+        finally:
+            conn.close()
+        contacts.extend(people.values())
+    return contacts
+
+
+def _search_addressbook(name: str, limit: int) -> list[dict[str, Any]]:
+    """Find contacts by name with a LIKE query against each Contacts store
+    
+    Matches names containing `name`, or failing that, names contained in it.
+    Raises sqlite3.Error/OSError when the stores can't be read.
+    """
+    pattern = "%" + re.sub(r"([\\%_])", r"\\\1", name) + "%"
+    queries = [
+        (f"SELECT Z_PK, {_ADDRESSBOOK_NAME} AS name FROM ZABCDRECORD "
+         "WHERE name LIKE ? ESCAPE '\\' ORDER BY Z_PK LIMIT ?", (pattern, limit)),
+        (f"SELECT Z_PK, {_ADDRESSBOOK_NAME} AS name FROM ZABCDRECORD "
+         "WHERE ? LIKE '%' || name || '%' ORDER BY Z_PK LIMIT ?", (name, limit)),
+    ]
+    databases = _addressbook_databases()
+    
+    for query, params in queries:
+        matches: list[dict[str, Any]] = []
+        for database in databases:
+            if len(matches) >= limit:
+                break
+            conn = _open_addressbook_db(database)
+            try:
+                people = {
+                    pk: {"name": person_name, "phones": [], "emails": []}
+                    for pk, person_name in conn.execute(query, params)
+                }
+                if not people:
+                    continue
+                _add_addressbook_details(conn, people, owners=json.dumps(list(people)))
+            finally:
+                conn.close()
+            matches.extend(people.values())
+        if matches:
+            return matches[:limit]
+    return []
+
+
+def _addressbook_signature() -> list[list] | None:
+    """Identify the current state of the Contacts databases by path and mtime
+    
+    Contacts keeps its stores in WAL mode, so the -wal files are included too.
+    Returns None if the databases can't be found.
+    """
+    try:
+        signature = []
+        for database in _addressbook_databases():
+            wal = Path(f"{database}-wal")
+            signature.append([
+                str(database),
+                database.stat().st_mtime_ns,
+                wal.stat().st_mtime_ns if wal.exists() else 0,
+            ])
+        return signature
+    except OSError:
+        return None
+
+
+# Error number AppleScript reports when we lack Automation permission for an app
+_NOT_AUTHORIZED = -1743
+
+
+def _applescript_string(text: str) -> str:
+    """Quote `text` as an AppleScript string literal"""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def _unquote_applescript_string(text: str) -> str:
+    """Decode a string result printed in source form (`-s s`)"""
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        escapes = {'n': '\n', 'r': '\r', 't': '\t'}
+        return re.sub(r'\\(.)', lambda m: escapes.get(m[1], m[1]), text[1:-1], flags=re.S)
+    return text
+
+
+class _OsascriptWorker:
+    """One long-lived `osascript -i` process that every script is piped to
     
-    print("Loading contact cache...")
+    Starting osascript and loading the AppleScript component costs more than
+    most of our scripts take to run. Each script is sent as a single
+    `run script` statement followed by a unique string literal whose echo
+    marks the end of its output.
+    """
     
-    # Get all contacts with a reasonable timeout
-    script = '''
-tell application "Contacts"
-    set contactList to {}
-    set allPeople to people
+    _ERROR_MARKER = "__osascript_error__"
     
-    repeat with currentPerson in allPeople
-        try
-            set personName to name of currentPerson
-            set personPhones to {}
-            
-            -- Get phone numbers
-            try
-                set phonesList to phones of currentPerson
-                repeat with phoneItem in phonesList
-                    try
-                        set phoneValue to value of phoneItem
-                        if phoneValue is not "" then
-                            set personPhones to personPhones & {phoneValue}
-                        end if
-                    on error
-                    end try
-                end repeat
-            on error
-            end try
-            
-            -- Format output (simplified - just name and phones)
-            if (count of personPhones) > 0 then
-                set phoneString to ""
-                repeat with i from 1 to count of personPhones
-                    set phoneString to phoneString & item i of personPhones
-                    if i < count of personPhones then
-                        set phoneString to phoneString & ";"
-                    end if
-                end repeat
-                
-                set contactInfo to personName & "|" & phoneString
-                set contactList to contactList & {contactInfo}
-            end if
-        on error
-        end try
-    end repeat
+    def __init__(self):
+        self._process: subprocess.Popen | None = None
+        self._lock = threading.Lock()
     
-    -- Return as delimited string
-    set AppleScript's text item delimiters to "\\n"
-    set resultString to contactList as string
-    set AppleScript's text item delimiters to ""
+    def _ensure_started(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["osascript", "-i", "-s", "s"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+            )
+        return self._process
     
-    return resultString
-end tell
-'''
+    def close(self):
+        """Stop the osascript process; the next run starts a new one"""
+        process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
     
-    try:
-        result = run_applescript(script, timeout=60)  # Allow 60 seconds to load all contacts
-        
-        CONTACT_CACHE = {}
-        CONTACT_PHONE_LOOKUP = {}
+    def run(self, script: str, timeout: float = 30) -> str:
+        """Run `script` and return its result, raising on AppleScript errors"""
+        # Catch errors inside the script so they come back framed like results
+        wrapped = (
+            f"try\n{script}\non error errMsg number errNum\n"
+            f'return "{self._ERROR_MARKER}" & errNum & "|" & errMsg\nend try'
+        )
+        sentinel = f"__osascript_done_{uuid.uuid4().hex}__"
         
-        if result:
-            lines = result.strip().split('\n')
-            for line in lines:
-                if '|' in line:
-                    parts = line.split('|')
-                    if len(parts) >= 2:
-                        name = parts[0].strip()
-                        phones = [p.strip() for p in parts[1].split(';') if p.strip()]
-                        
-                        CONTACT_CACHE[name] = phones
-                        
-                        # Build reverse lookup with normalized phones
-                        for phone in phones:
-                            normalized = normalize_phone(phone)
-                            if normalized:
-                                CONTACT_PHONE_LOOKUP[normalized] = name
-                                
-                                # Also store without country code for flexibility
-                                if normalized.startswith('1') and len(normalized) == 11:
-                                    CONTACT_PHONE_LOOKUP[normalized[1:]] = name
+        with self._lock:
+            process = self._ensure_started()
+            try:
+                process.stdin.write(
+                    f"run script {_applescript_string(wrapped)}\n\"{sentinel}\"\n".encode()
+                )
+                output = self._read_until(process, sentinel.encode(), timeout)
+            except BaseException:
+                # The interpreter may be mid-script or gone; don't reuse it
+                self.close()
+                raise
         
-        print(f"Loaded {len(CONTACT_CACHE)} contacts with {len(CONTACT_PHONE_LOOKUP)} phone numbers")
+        # Everything before the sentinel's own line is the script's output
+        output = output.rpartition("\n")[0]
+        output = re.sub(r"^(?:>> ?)+", "", output, flags=re.M).strip()
+        if not output.startswith("=>"):
+            raise Exception(f"AppleScript error: {output}")
+        result = _unquote_applescript_string(output[2:].strip())
         
-    except Exception as e:
-        print(f"Failed to load contact cache: {e}")
-        CONTACT_CACHE = {}
-        CONTACT_PHONE_LOOKUP = {}
-
-
-def run_applescript(script: str, timeout: int = 30) -> str:
-    """Run an AppleScript and return the result"""
-    try:
+        if result.startswith(self._ERROR_MARKER):
+            number, _, message = result[len(self._ERROR_MARKER):].partition("|")
+            if number == str(_NOT_AUTHORIZED):
+                message = f"Not authorized to send Apple events ({message})"
+            raise Exception(f"AppleScript error: {message}")
+        return result
+    
+    def _read_until(self, process: subprocess.Popen, marker: bytes, timeout: float) -> str:
+        deadline = time.monotonic() + timeout
+        fd = process.stdout.fileno()
+        buffer = bytearray()
+        while True:
+            found = buffer.find(marker, max(0, len(buffer) - 65536 - len(marker)))
+            if found != -1:
+                return buffer[:found].decode("utf-8", errors="replace")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise subprocess.TimeoutExpired(process.args, timeout)
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise Exception("osascript exited unexpectedly")
+            buffer += chunk
+
+
+_OSASCRIPT = _OsascriptWorker()
+atexit.register(_OSASCRIPT.close)
+
+
+@cache
+def _compiled_applescript(script: str) -> Path:
+    """Compile `script` with osacompile once, reusing the .scpt across runs"""
+    digest = hashlib.sha1(script.encode()).hexdigest()
+    compiled = Path(APPLESCRIPT_CACHE_DIR) / f"{digest}.scpt"
+    if not compiled.exists():
+        compiled.parent.mkdir(parents=True, exist_ok=True)
+        source = compiled.with_suffix(".applescript")
+        source.write_text(script, encoding="utf-8")
+        tmp_path = compiled.with_name(f"{compiled.name}.{uuid.uuid4().hex}.tmp")
         result = subprocess.run(
-            ['osascript', '-e', script],
+            ["osacompile", "-o", str(tmp_path), str(source)],
             capture_output=True,
             text=True,
-            timeout=timeout
         )
         if result.returncode != 0:
-            if "Not authorized to send Apple events" in result.stderr:
-                raise Exception(
-                    "Permission denied: Please grant Contacts access.\n"
-                    "1. Open System Settings > Privacy & Security > Automation\n"
-                    "2. Find your terminal app (Terminal/iTerm/VS Code) in the list\n"
-                    "3. Enable the checkbox next to 'Contacts'\n"
-                    "4. Restart your terminal and try again"
-                )
-            raise Exception(f"AppleScript error: {result.stderr}")
-        return result.stdout.strip()
+            raise Exception(f"AppleScript compile error: {result.stderr.strip()}")
+        os.replace(tmp_path, compiled)
+    return compiled
+
+
+def run_applescript(script: str, timeout: int = 30, args: list[str] | None = None) -> str:
+    """Run an AppleScript on the shared osascript worker and return the result
+    
+    Scripts are compiled once and run from the .scpt. Values the script needs
+    are passed as `args` to its `on run argv` handler instead of being
+    interpolated into the source.
+    """
+    try:
+        statement = f"run script (POSIX file {_applescript_string(str(_compiled_applescript(script)))})"
+        if args:
+            statement += f" with parameters {{{', '.join(map(_applescript_string, args))}}}"
+        return _OSASCRIPT.run(f"return {statement}", timeout)
     except subprocess.TimeoutExpired:
         raise Exception(f"AppleScript execution timed out after {timeout} seconds")
     except Exception as e:
-        if "Permission denied" in str(e):
-            raise e
+        if "Not authorized to send Apple events" in str(e):
+            raise Exception(
+                "Permission denied: Please grant Contacts access.\n"
+                "1. Open System Settings > Privacy & Security > Automation\n"
+                "2. Find your terminal app (Terminal/iTerm/VS Code) in the list\n"
+                "3. Enable the checkbox next to 'Contacts'\n"
+                "4. Restart your terminal and try again"
+            )
         raise Exception(f"Failed to run AppleScript: {str(e)}")
 
 
 @mcp.tool
+@_threaded
 def get_contacts_count() -> Dict[str, Any]:
     """Get the total number of contacts in your Contacts app"""
-    script = '''
-tell application "Contacts"
-    set totalCount to count of people
-    return totalCount
-end tell
-'''
-    
     try:
-        result = run_applescript(script, timeout=5)  # Quick operation
-        count = int(result) if result else 0
+        count = len(_load_contacts())
         return {
             "total_contacts": count,
             "message": f"You have {count} contacts in your Contacts app"
@@ -856,73 +1715,66 @@ end tell
 
 
 @mcp.tool
+@_threaded
 def get_all_messages_by_date(target_date: str, include_stats: bool = True) -> Dict[str, Any]:
     """Get ALL messages from ALL chats on a specific date (your daily journal/TBT)
-    
+
     Args:
         target_date: Date in format 'YYYY-MM-DD' (e.g., '2024-01-15')
         include_stats: Whether to include statistics about the day
-    
+
     Returns:
         Dictionary with messages, contacts involved, and optional stats
     """
-    conn = get_db_connection()
     try:
-        cursor = conn.cursor()
-        
-        # Parse the date and create start/end timestamps for that day
-        from datetime import datetime, timedelta
-        
-        # Parse the input date
-        dt_start = datetime.strptime(target_date, '%Y-%m-%d')
-        dt_end = dt_start + timedelta(days=1)
-        
-        # Convert to Apple epoch (nanoseconds since 2001-01-01)
-        # Unix timestamp for 2001-01-01 00:00:00 UTC is 978307200
-        apple_epoch_start = int((dt_start.timestamp() - 978307200) * 1000000000)
-        apple_epoch_end = int((dt_end.timestamp() - 978307200) * 1000000000)
-        
+        # Apple epoch bounds of the (local) day, via the shared cached conversion
+        day = datetime.strptime(target_date, '%Y-%m-%d').date()
+        apple_epoch_start = _apple_epoch_ns(day.isoformat())
+        apple_epoch_end = _apple_epoch_ns((day + timedelta(days=1)).isoformat())
+
         # Query to get all messages from that day
         query = """
-        SELECT 
+        SELECT
             m.guid,
             m.text,
             m.is_from_me,
-            datetime(m.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as date_time,
-            time(m.date/1000000000 + strftime('%s', '2001-01-01'), 'unixepoch', 'localtime') as time_only,
-            h.id as contact,
+            m.date,
+            m.handle_id,
             c.chat_identifier,
             c.display_name as chat_name
         FROM message m
-        LEFT JOIN handle h ON m.handle_id = h.ROWID
         LEFT JOIN chat_message_join cmj ON m.ROWID = cmj.message_id
         LEFT JOIN chat c ON cmj.chat_id = c.ROWID
         WHERE m.date >= ? AND m.date < ?
             AND m.text IS NOT NULL
         ORDER BY m.date ASC
         """
-        
-        cursor.execute(query, (apple_epoch_start, apple_epoch_end))
-        messages = []
+
+        with borrow_conn() as conn:
+            messages = []
+            for msg in _iter_rows(conn.execute(query, (apple_epoch_start, apple_epoch_end))):
+                msg["contact"] = _resolve_handle(conn, msg.pop("handle_id"))
+                messages.append(msg)
+
         contacts_involved = set()
         conversation_threads = {}
-        
-        for row in cursor.fetchall():
-            msg = dict(row)
-            contact = msg.get("contact", "Unknown")
-            
+
+        for msg in messages:
+            contact = msg["contact"]
+            date_time = _format_apple_date(msg.pop("date"))
+            msg["date_time"] = date_time
+            msg["time_only"] = date_time[11:] if date_time else None
+
             # Track unique contacts
             if contact and not msg.get("is_from_me"):
                 contacts_involved.add(contact)
-            
+
             # Group by conversation thread
             chat_id = msg.get("chat_identifier", "Unknown")
             if chat_id not in conversation_threads:
                 conversation_threads[chat_id] = []
             conversation_threads[chat_id].append(msg)
-            
-            messages.append(msg)
-        
+
         result = {
             "date": target_date,
             "total_messages": len(messages),
@@ -930,12 +1782,12 @@ def get_all_messages_by_date(target_date: str, include_stats: bool = True) -> Di
             "contacts_involved": list(contacts_involved),
             "conversation_count": len(conversation_threads)
         }
-        
+
         # Add statistics if requested
         if include_stats:
             sent_count = sum(1 for m in messages if m.get("is_from_me"))
             received_count = len(messages) - sent_count
-            
+
             # Find most active conversation
             most_active_chat = None
             max_messages = 0
@@ -943,27 +1795,26 @@ def get_all_messages_by_date(target_date: str, include_stats: bool = True) -> Di
                 if len(msgs) > max_messages:
                     max_messages = len(msgs)
                     most_active_chat = chat_id
-            
+
             # Time-based analysis
             if messages:
                 first_msg_time = messages[0].get("time_only", "")
                 last_msg_time = messages[-1].get("time_only", "")
-                
+
                 # Get busiest hour
-                from collections import Counter
                 hours = []
                 for msg in messages:
                     time_str = msg.get("time_only", "")
                     if time_str:
                         hour = time_str.split(":")[0]
                         hours.append(f"{hour}:00")
-                
+
                 busiest_hour = None
                 if hours:
                     counter = Counter(hours)
                     busiest = counter.most_common(1)[0]
                     busiest_hour = {"time": busiest[0], "message_count": busiest[1]}
-                
+
                 result["stats"] = {
                     "sent_messages": sent_count,
                     "received_messages": received_count,
@@ -975,16 +1826,15 @@ def get_all_messages_by_date(target_date: str, include_stats: bool = True) -> Di
                     "last_message_time": last_msg_time,
                     "busiest_hour": busiest_hour
                 }
-        
+
         return result
-        
+
     except Exception as e:
         return {"error": f"Failed to get messages for date {target_date}: {str(e)}"}
-    finally:
-        conn.close()
 
 
 @mcp.tool
+@_threaded
 def send_message(phone_number: str, message: str) -> Dict[str, Any]:
     """Send an iMessage to a phone number or email address
     
@@ -1001,25 +1851,26 @@ def send_message(phone_number: str, message: str) -> Dict[str, Any]:
     if not message or not message.strip():
         return {"error": "Message text is required"}
     
-    # Escape special characters in the message
-    escaped_message = message.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-    
-    # AppleScript to send the message
-    script = f'''
-tell application "Messages"
-    try
-        set targetService to 1st service whose service type = iMessage
-        set targetBuddy to buddy "{phone_number}" of targetService
-        send "{escaped_message}" to targetBuddy
-        return "SUCCESS"
-    on error errMsg
-        return "ERROR: " & errMsg
-    end try
-end tell
+    # The recipient and text are passed as arguments, so they need no escaping
+    script = '''
+on run argv
+    set recipient to item 1 of argv
+    set messageText to item 2 of argv
+    tell application "Messages"
+        try
+            set targetService to 1st service whose service type = iMessage
+            set targetBuddy to buddy recipient of targetService
+            send messageText to targetBuddy
+            return "SUCCESS"
+        on error errMsg
+            return "ERROR: " & errMsg
+        end try
+    end tell
+end run
 '''
     
     try:
-        result = run_applescript(script, timeout=10)
+        result = run_applescript(script, timeout=10, args=[phone_number, message])
         
         if result and "SUCCESS" in result:
             return {
@@ -1050,82 +1901,127 @@ end tell
         }
 
 
-@mcp.tool
-def check_contacts_permission() -> Dict[str, Any]:
-    """Check if the app has permission to access Contacts and provide setup instructions"""
-    try:
-        # Simple test to check Contacts access
-        test_script = 'tell application "Contacts" to return name'
-        run_applescript(test_script)
+def _permission_status(error: Exception | None = None) -> dict[str, Any]:
+    """Describe Contacts access given the error from a Contacts script, if any"""
+    if error is None:
         return {
             "has_permission": True,
             "message": "Contacts access is granted. You can use all contact-related tools."
         }
+    error_msg = str(error)
+    if "Permission denied" in error_msg or "Not authorized" in error_msg:
+        return {
+            "has_permission": False,
+            "message": error_msg,
+            "instructions": [
+                "To enable Contacts access:",
+                "1. Open System Settings (System Preferences on older macOS)",
+                "2. Go to Privacy & Security > Automation",
+                "3. Find your terminal application:",
+                "   - Terminal.app",
+                "   - iTerm.app", 
+                "   - Visual Studio Code",
+                "   - Or whatever terminal you're using",
+                "4. Click the checkbox next to 'Contacts' to enable access",
+                "5. You may need to restart your terminal application",
+                "",
+                "Alternative method:",
+                "1. Open System Settings > Privacy & Security > Contacts",
+                "2. Click the '+' button",
+                "3. Add your terminal application",
+                "4. Restart the terminal"
+            ]
+        }
+    else:
+        return {
+            "has_permission": False,
+            "message": f"Unable to access Contacts: {error_msg}"
+        }
+
+
+def _contacts_permission() -> dict[str, Any]:
+    """Probe Contacts access over AppleScript, unless the snapshot already proves it"""
+    # A snapshot read over AppleScript recently already proves access; one read
+    # from the Contacts databases doesn't, since it needs no Automation permission
+    cache = _contacts_cache
+    if cache["source"] == "applescript" and time.monotonic() - cache["loaded_at"] < CONTACTS_TTL:
+        return _permission_status()
+    
+    try:
+        # Simple test to check Contacts access
+        test_script = 'tell application "Contacts" to return name'
+        run_applescript(test_script)
+        return _permission_status()
     except Exception as e:
-        error_msg = str(e)
-        if "Permission denied" in error_msg or "Not authorized" in error_msg:
-            return {
-                "has_permission": False,
-                "message": error_msg,
-                "instructions": [
-                    "To enable Contacts access:",
-                    "1. Open System Settings (System Preferences on older macOS)",
-                    "2. Go to Privacy & Security > Automation",
-                    "3. Find your terminal application:",
-                    "   - Terminal.app",
-                    "   - iTerm.app", 
-                    "   - Visual Studio Code",
-                    "   - Or whatever terminal you're using",
-                    "4. Click the checkbox next to 'Contacts' to enable access",
-                    "5. You may need to restart your terminal application",
-                    "",
-                    "Alternative method:",
-                    "1. Open System Settings > Privacy & Security > Contacts",
-                    "2. Click the '+' button",
-                    "3. Add your terminal application",
-                    "4. Restart the terminal"
-                ]
-            }
-        else:
-            return {
-                "has_permission": False,
-                "message": f"Unable to access Contacts: {error_msg}"
-            }
+        return _permission_status(e)
+
+
+@mcp.tool
+@_threaded
+def check_contacts_permission() -> dict[str, Any]:
+    """Check if the app has permission to access Contacts and provide setup instructions"""
+    return _contacts_permission()
 
 
 @mcp.tool
-def get_all_contacts(limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-    """Get contacts from macOS Contacts app with pagination support
+@_threaded
+def get_contacts_bundle(limit: int = 50, after_id: str | None = None, offset: int = 0) -> dict[str, Any]:
+    """Get Contacts permission status, the total count and a page of contacts in one call
+    
+    Equivalent to check_contacts_permission + get_contacts_count +
+    get_all_contacts, but all three come from the same contact snapshot, so
+    opening a contact list costs at most one AppleScript run instead of three.
+    Permission is only taken as granted from a snapshot dumped over
+    AppleScript; otherwise it's probed as in check_contacts_permission.
     
     Args:
         limit: Maximum number of contacts to return (default 50)
-        offset: Number of contacts to skip (for pagination, default 0)
+        after_id: Contact id to continue after (from `next_cursor`)
+        offset: Deprecated - number of contacts to skip, used when
+            `after_id` isn't given
     
     Returns:
-        Dictionary with contacts, total count, and pagination info
+        Dictionary with permission, total_contacts, contacts and pagination
     """
-    script = f'''
+    try:
+        all_contacts = _load_contacts()
+    except Exception as e:
+        return {"permission": _permission_status(e), "total_contacts": 0, "contacts": []}
+    
+    bundle = _contacts_page(all_contacts, limit, after_id, offset)
+    bundle["permission"] = _contacts_permission()
+    bundle["total_contacts"] = len(all_contacts)
+    return bundle
+
+
+def _parse_contact_records(output: str) -> list[dict[str, Any]]:
+    """Parse the snapshot dump: one name/phones/emails/id record per contact"""
+    contacts = []
+    for match in _CONTACT_RECORD.finditer(output):
+        name, phones, emails, contact_id = match.groups()
+        contacts.append({
+            "id": contact_id,
+            "name": name,
+            "phones": phones.split(ITEM_SEP) if phones else [],
+            "emails": emails.split(ITEM_SEP) if emails else []
+        })
+    return contacts
+
+
+def _read_applescript_snapshot() -> list[dict[str, Any]]:
+    """Dump every contact's name, labelled phones and emails, and id in one AppleScript run"""
+    script = '''
 tell application "Contacts"
-    set contactList to {{}}
-    set allPeople to people
-    set totalCount to count of allPeople
-    set startIndex to {offset + 1}
-    set endIndex to {offset + limit}
-    
-    if startIndex > totalCount then
-        return "EMPTY|0|" & totalCount
-    end if
-    
-    if endIndex > totalCount then
-        set endIndex to totalCount
-    end if
-    
-    repeat with i from startIndex to endIndex
-        set currentPerson to item i of allPeople
+    set contactList to {}
+    set recordSep to character id 30
+    set fieldSep to character id 31
+    set itemSep to character id 29
+    
+    repeat with currentPerson in people
         try
             set personName to name of currentPerson
-            set personPhones to {{}}
-            set personEmails to {{}}
+            set personPhones to {}
+            set personEmails to {}
             
             -- Get phone numbers
             try
@@ -1135,7 +2031,7 @@ tell application "Contacts"
                         set phoneValue to value of phoneItem
                         set phoneLabel to label of phoneItem
                         if phoneValue is not "" then
-                            set personPhones to personPhones & {{phoneLabel & ": " & phoneValue}}
+                            set end of personPhones to phoneLabel & ": " & phoneValue
                         end if
                     on error
                         -- Skip problematic phone entries
@@ -1153,7 +2049,7 @@ tell application "Contacts"
                         set emailValue to value of emailItem
                         set emailLabel to label of emailItem
                         if emailValue is not "" then
-                            set personEmails to personEmails & {{emailLabel & ": " & emailValue}}
+                            set end of personEmails to emailLabel & ": " & emailValue
                         end if
                     on error
                         -- Skip problematic email entries
@@ -1163,107 +2059,261 @@ tell application "Contacts"
                 -- No emails
             end try
             
-            -- Format output
-            set contactInfo to personName & "|"
-            
-            -- Add phones
-            repeat with i from 1 to count of personPhones
-                set contactInfo to contactInfo & item i of personPhones
-                if i < count of personPhones then
-                    set contactInfo to contactInfo & ";"
-                end if
-            end repeat
-            
-            set contactInfo to contactInfo & "|"
-            
-            -- Add emails
-            repeat with i from 1 to count of personEmails
-                set contactInfo to contactInfo & item i of personEmails
-                if i < count of personEmails then
-                    set contactInfo to contactInfo & ";"
-                end if
-            end repeat
-            
-            set contactList to contactList & {{contactInfo}}
+            -- Format output, joining each list in one coercion
+            set AppleScript's text item delimiters to itemSep
+            set phonesJoined to personPhones as string
+            set emailsJoined to personEmails as string
+            set contactInfo to personName & fieldSep & phonesJoined & fieldSep & emailsJoined & fieldSep & (id of currentPerson)
+            set end of contactList to contactInfo
         on error
             -- Skip problematic contacts
         end try
     end repeat
     
-    -- Return as delimited string with count
-    set AppleScript's text item delimiters to "\\n"
+    -- Return as delimited string
+    set AppleScript's text item delimiters to recordSep
     set resultString to contactList as string
     set AppleScript's text item delimiters to ""
     
-    return "DATA|" & (endIndex - startIndex + 1) & "|" & totalCount & "\\n" & resultString
+    return resultString
 end tell
 '''
     
+    result = run_applescript(script, timeout=120)  # One pass over the whole address book
+    return _parse_contact_records(result)
+
+
+def _read_saved_contacts(signature: list[list] | None) -> list[dict[str, Any]] | None:
+    """Return the AppleScript dump saved at CONTACTS_CACHE_PATH, if it's still current
+    
+    A dump is current if it was saved under the same Contacts signature, or,
+    when there's no signature to compare, if it's under CONTACTS_SAVED_TTL old.
+    """
     try:
-        result = run_applescript(script)
-        
-        if result.startswith("EMPTY"):
-            parts = result.split("|")
-            total = int(parts[2]) if len(parts) > 2 else 0
-            return {
-                "contacts": {},
-                "pagination": {
-                    "offset": offset,
-                    "limit": limit,
-                    "total": total,
-                    "returned": 0,
-                    "has_more": False
-                }
-            }
+        with open(CONTACTS_CACHE_PATH, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(saved, dict):
+        return None
+    if signature is not None:
+        current = saved.get("signature") == signature
+    else:
+        saved_at = saved.get("saved_at")
+        current = (
+            saved.get("signature") is None
+            and isinstance(saved_at, int | float)
+            and time.time() - saved_at < CONTACTS_SAVED_TTL
+        )
+    return saved.get("contacts") if current else None
+
+
+def _save_contacts(signature: list[list] | None, contacts: list[dict[str, Any]]):
+    """Write an AppleScript dump to CONTACTS_CACHE_PATH, tagged with the Contacts signature"""
+    path = Path(CONTACTS_CACHE_PATH)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"signature": signature, "saved_at": time.time(), "contacts": contacts}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not save contacts: {e}")
+
+
+def _load_contacts(fallback: bool = True) -> list[dict[str, Any]]:
+    """Return every contact, in id order, from the in-process snapshot
+    
+    The snapshot is rebuilt only when the Contacts databases' mtimes change, so
+    just the first call after an edit pays for reading Contacts. If the
+    databases can't be stat'ed, a snapshot is trusted for CONTACTS_TTL seconds.
+    AppleScript dumps are saved to disk, so a restart reuses the last one while
+    it's current. With `fallback=False`, errors reading the databases are
+    raised instead of dumping the contacts over AppleScript.
+    """
+    global _contacts_cache
+    
+    signature = _addressbook_signature()
+    with _CONTACTS_SNAPSHOT_LOCK:
+        cache = _contacts_cache
+        if cache["data"] is not None:
+            if signature is not None:
+                fresh = cache["signature"] == signature
+            else:
+                fresh = time.monotonic() - cache["loaded_at"] < CONTACTS_TTL
+            if fresh:
+                return cache["data"]
         
-        lines = result.strip().split('\n')
-        metadata_line = lines[0] if lines else ""
-        contact_lines = lines[1:] if len(lines) > 1 else []
+        # Reading the Contacts databases takes milliseconds; the AppleScript dump
+        # is for when they aren't readable (e.g. no Full Disk Access). A saved dump
+        # says nothing about current permission, so it gets its own source.
+        data = _read_saved_contacts(signature)
+        if data is not None:
+            source = "saved"
+        else:
+            try:
+                data, source = _read_addressbook_snapshot(), "addressbook"
+            except (sqlite3.Error, OSError):
+                if not fallback:
+                    raise
+                data, source = _read_applescript_snapshot(), "applescript"
+                _save_contacts(signature, data)
+        data.sort(key=lambda contact: contact["id"])
+        by_name_lower = [(contact["name"].lower(), contact) for contact in data]
         
-        # Parse metadata
-        total_count = 0
-        returned_count = 0
-        if metadata_line.startswith("DATA|"):
-            meta_parts = metadata_line.split("|")
-            if len(meta_parts) >= 3:
-                returned_count = int(meta_parts[1])
-                total_count = int(meta_parts[2])
+        # Every 3-character run of each name -> positions in by_name_lower, so a
+        # search only has to check the names sharing its first three characters
+        by_trigram: dict[str, list[int]] = {}
+        for i, (lowered, _) in enumerate(by_name_lower):
+            for trigram in {lowered[j:j + 3] for j in range(len(lowered) - 2)}:
+                by_trigram.setdefault(trigram, []).append(i)
         
-        contacts = {}
-        for line in contact_lines:
-            if '|' in line:
-                parts = line.split('|')
-                if len(parts) >= 2:
-                    name = parts[0].strip()
-                    phones = []
-                    emails = []
-                    
-                    if len(parts) > 1 and parts[1]:
-                        phones = [p.strip() for p in parts[1].split(';') if p.strip()]
-                    
-                    if len(parts) > 2 and parts[2]:
-                        emails = [e.strip() for e in parts[2].split(';') if e.strip()]
-                    
-                    contacts[name] = {
-                        "phones": phones,
-                        "emails": emails
-                    }
+        # Normalized phone numbers and lowercased emails -> positions in data, for
+        # searches that are really a handle. Entries are "label: value".
+        by_phone: dict[str, list[int]] = {}
+        by_email: dict[str, list[int]] = {}
+        for i, contact in enumerate(data):
+            for phone in contact["phones"]:
+                normalized = normalize_phone(phone.rpartition(": ")[2])
+                if normalized:
+                    by_phone.setdefault(normalized, []).append(i)
+            for email in contact["emails"]:
+                by_email.setdefault(email.rpartition(": ")[2].lower(), []).append(i)
         
-        return {
-            "contacts": contacts,
-            "pagination": {
-                "offset": offset,
-                "limit": limit,
-                "total": total_count,
-                "returned": len(contacts),
-                "has_more": (offset + limit) < total_count
-            }
+        # Replaced wholesale so readers never see a half-updated snapshot
+        _contacts_cache = {
+            "signature": signature,
+            "loaded_at": time.monotonic(),
+            "source": source,
+            "data": data,
+            "by_name_lower": by_name_lower,
+            "by_trigram": by_trigram,
+            "by_phone": by_phone,
+            "by_email": by_email,
+        }
+        return data
+
+
+def warm_contacts():
+    """Build the contact snapshot so the first contact tool doesn't pay for it
+    
+    Only the Contacts databases, or a dump saved by an earlier run, are read.
+    Without either the snapshot is left for the first contact tool to dump over
+    AppleScript, rather than holding the osascript worker (and with it
+    send_message) for minutes at startup.
+    """
+    try:
+        _load_contacts(fallback=False)
+    except (sqlite3.Error, OSError) as e:
+        logger.info(f"Skipping contact warm-up: {e}")
+
+
+def _contacts_page(
+    all_contacts: list[dict[str, Any]], limit: int, after_id: str | None, offset: int
+) -> dict[str, Any]:
+    """Slice one page out of the id-ordered snapshot, by cursor or (deprecated) offset"""
+    if after_id is not None:
+        start = bisect.bisect_right(all_contacts, after_id, key=lambda contact: contact["id"])
+    else:
+        start = max(offset, 0)
+    page = [dict(contact) for contact in all_contacts[start:start + limit]]
+    has_more = start + len(page) < len(all_contacts)
+    
+    # People can share a name, so index the page by name without dropping any
+    contacts_by_name = defaultdict(list)
+    for i, contact in enumerate(page):
+        contacts_by_name[contact["name"]].append(i)
+    
+    return {
+        "contacts": page,
+        "contacts_by_name": dict(contacts_by_name),
+        "pagination": {
+            "after_id": after_id,
+            "offset": start,
+            "limit": limit,
+            "total": len(all_contacts),
+            "returned": len(page),
+            "has_more": has_more,
+            "next_cursor": page[-1]["id"] if has_more and page else None
         }
+    }
+
+
+@mcp.tool
+@_threaded
+def get_all_contacts(limit: int = 50, after_id: str | None = None, offset: int = 0) -> dict[str, Any]:
+    """Get contacts from macOS Contacts app with cursor-based pagination
+    
+    Contacts are returned as a list in id order, with `contacts_by_name`
+    mapping each name to its positions in the list. Pass the previous page's
+    `pagination.next_cursor` as `after_id` to get the next page; unlike an
+    offset, the cursor stays put when contacts are added or removed.
+    
+    Args:
+        limit: Maximum number of contacts to return (default 50)
+        after_id: Contact id to continue after (from `next_cursor`)
+        offset: Deprecated - number of contacts to skip, used when
+            `after_id` isn't given
+    
+    Returns:
+        Dictionary with contacts, total count, and pagination info
+    """
+    try:
+        all_contacts = _load_contacts()
     except Exception as e:
         return {"error": str(e)}
+    
+    return _contacts_page(all_contacts, limit, after_id, offset)
+
+
+def _search_snapshot(search_name: str, limit: int) -> list[dict[str, Any]]:
+    """Find up to `limit` snapshot contacts whose lowercased name contains `search_name`
+    
+    Falls back to names contained in the search (e.g. "alex rivera jr" finds
+    "Alex Rivera"). Both passes stop as soon as `limit` contacts match.
+    """
+    cache = _contacts_cache
+    by_name_lower = cache["by_name_lower"]
+    
+    # Any name containing the search also contains its first three characters
+    if len(search_name) >= 3:
+        candidates = (by_name_lower[i] for i in cache["by_trigram"].get(search_name[:3], ()))
+    else:
+        candidates = iter(by_name_lower)
+    matches = list(islice(
+        (contact for lowered, contact in candidates if search_name in lowered), limit
+    ))
+    
+    if not matches:
+        matches = list(islice(
+            (contact for lowered, contact in by_name_lower if lowered and lowered in search_name),
+            limit,
+        ))
+    return matches
+
+
+def _find_contacts_by_handle(handle: str, limit: int) -> list[dict[str, Any]] | None:
+    """Look up a phone number or email in the snapshot's indexes
+    
+    Returns None when `handle` doesn't look like one, or the snapshot can't be loaded.
+    """
+    if "@" in handle:
+        index, key = "by_email", handle.lower()
+    elif _PHONE_LIKE.fullmatch(handle):
+        index, key = "by_phone", normalize_phone(handle)
+    else:
+        return None
+    
+    try:
+        _load_contacts()
+    except Exception:
+        return None
+    cache = _contacts_cache
+    return [cache["data"][i] for i in cache[index].get(key, ())[:limit]]
 
 
 @mcp.tool
+@_threaded
 def find_contact_by_name(name: str, limit: int = 10) -> Dict[str, Any]:
     """Find contacts by name and return their phone numbers and emails
     
@@ -1277,160 +2327,33 @@ def find_contact_by_name(name: str, limit: int = 10) -> Dict[str, Any]:
     if not name or name.strip() == "":
         return {"error": "Name parameter is required"}
     
-    search_name = name.strip().replace('"', '\\"')  # Escape quotes
+    # Callers often pass a handle (phone number or email) rather than a name
+    matches = _find_contacts_by_handle(name.strip(), limit)
     
-    # Optimized AppleScript that uses 'whose' clause for faster searching
-    script = f'''
-on run
-    tell application "Contacts"
-        set matchedContacts to {{}}
-        set searchText to "{search_name}"
-        
-        -- Use 'whose' clause for faster searching
-        try
-            set matchingPeople to (people whose name contains searchText)
-        on error
-            -- If no exact matches, try broader search
-            set matchingPeople to {{}}
-        end try
-        
-        -- If no matches with contains, try more lenient search
-        if (count of matchingPeople) = 0 then
-            set allPeople to people
-            set maxSearch to 100
-            if (count of allPeople) < maxSearch then
-                set maxSearch to count of allPeople
-            end if
-            
-            repeat with i from 1 to maxSearch
-                try
-                    set currentPerson to item i of allPeople
-                    set personName to name of currentPerson
-                    
-                    ignoring case
-                        if personName contains searchText or searchText contains personName then
-                            set matchingPeople to matchingPeople & {{currentPerson}}
-                        end if
-                    end ignoring
-                on error
-                end try
-            end repeat
-        end if
-        
-        -- Limit results
-        set resultLimit to {limit}
-        if (count of matchingPeople) > resultLimit then
-            set matchingPeople to items 1 thru resultLimit of matchingPeople
-        end if
-        
-        -- Process matched contacts
-        repeat with currentPerson in matchingPeople
-            try
-                set personName to name of currentPerson
-                set personPhones to {{}}
-                set personEmails to {{}}
-                
-                -- Get phone numbers
-                try
-                    set phonesList to phones of currentPerson
-                    repeat with phoneItem in phonesList
-                        try
-                            set phoneValue to value of phoneItem
-                            set phoneLabel to label of phoneItem
-                            if phoneValue is not "" then
-                                set personPhones to personPhones & {{phoneLabel & ": " & phoneValue}}
-                            end if
-                        on error
-                        end try
-                    end repeat
-                on error
-                end try
-                
-                -- Get email addresses
-                try
-                    set emailsList to emails of currentPerson
-                    repeat with emailItem in emailsList
-                        try
-                            set emailValue to value of emailItem
-                            set emailLabel to label of emailItem
-                            if emailValue is not "" then
-                                set personEmails to personEmails & {{emailLabel & ": " & emailValue}}
-                            end if
-                        on error
-                        end try
-                    end repeat
-                on error
-                end try
-                
-                -- Format output
-                set contactInfo to personName & "|"
-                
-                -- Add phones
-                repeat with i from 1 to count of personPhones
-                    set contactInfo to contactInfo & item i of personPhones
-                    if i < count of personPhones then
-                        set contactInfo to contactInfo & ";"
-                    end if
-                end repeat
-                
-                set contactInfo to contactInfo & "|"
-                
-                -- Add emails
-                repeat with i from 1 to count of personEmails
-                    set contactInfo to contactInfo & item i of personEmails
-                    if i < count of personEmails then
-                        set contactInfo to contactInfo & ";"
-                    end if
-                end repeat
-                
-                set matchedContacts to matchedContacts & {{contactInfo}}
-            on error
-            end try
-        end repeat
-        
-        -- Return as delimited string
-        set AppleScript's text item delimiters to "\\n"
-        set resultString to matchedContacts as string
-        set AppleScript's text item delimiters to ""
-        
-        return resultString
-    end tell
-end run
-'''
+    # Query the Contacts databases directly; the snapshot (and its AppleScript
+    # dump) is only needed when they can't be read
+    if not matches:
+        try:
+            matches = _search_addressbook(name.strip(), limit)
+        except (sqlite3.Error, OSError):
+            matches = None
     
-    try:
-        result = run_applescript(script)
-        matches = []
-        
-        if result:
-            lines = result.strip().split('\n')
-            for line in lines:
-                if '|' in line:
-                    parts = line.split('|')
-                    if len(parts) >= 2:
-                        contact_name = parts[0].strip()
-                        phones = []
-                        emails = []
-                        
-                        if len(parts) > 1 and parts[1]:
-                            phones = [p.strip() for p in parts[1].split(';') if p.strip()]
-                        
-                        if len(parts) > 2 and parts[2]:
-                            emails = [e.strip() for e in parts[2].split(';') if e.strip()]
-                        
-                        matches.append({
-                            "name": contact_name,
-                            "phones": phones,
-                            "emails": emails
-                        })
-        
-        if matches:
-            return {"matches": matches, "count": len(matches)}
-        else:
-            return {"message": f"No contacts found matching '{name}'", "matches": []}
-            
-    except Exception as e:
-        return {"error": str(e)}
+    if matches is None:
+        try:
+            _load_contacts()
+        except Exception as e:
+            return {"error": str(e)}
+        matches = _search_snapshot(name.strip().lower(), limit)
+    
+    matches = [
+        {"name": contact["name"], "phones": contact["phones"], "emails": contact["emails"]}
+        for contact in matches
+    ]
+    
+    if matches:
+        return {"matches": matches, "count": len(matches)}
+    else:
+        return {"message": f"No contacts found matching '{name}'", "matches": []}
 
 
 # Removed find_contact_by_phone - it was timing out with large contact lists
@@ -1442,47 +2365,28 @@ end run
 # Removed get_messages_with_contact_names - depends on match_phone_to_contact which was removed
 
 
+# Keys of the handle records returned by get_handles and get_handle_details
+HANDLE_COLUMNS = ("id", "phone_or_email", "service", "uncanonicalized_id")
+_HANDLE_SELECT = "SELECT ROWID, id, service, uncanonicalized_id FROM handle"
+
+
 @mcp.tool
+@_threaded
 def get_handles(limit: int = 100) -> list[dict]:
     """Get a list of handles (contacts) with their phone numbers or emails"""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        query = """
-        SELECT 
-            handle.ROWID as id,
-            handle.id as phone_or_email,
-            handle.service,
-            handle.uncanonicalized_id
-        FROM handle 
-        LIMIT ?
-        """
-        cursor.execute(query, (limit,))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    with borrow_conn() as conn:
+        # Bounded by limit, so fetch in one call and zip against fixed keys
+        rows = conn.execute(f"{_HANDLE_SELECT} LIMIT ?", (limit,)).fetchall()
+        return [dict(zip(HANDLE_COLUMNS, row)) for row in rows]
 
 
 @mcp.tool
+@_threaded
 def get_handle_details(handle_id: int) -> Optional[dict]:
     """Get details for a specific handle by its ROWID"""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        query = """
-        SELECT 
-            handle.ROWID as id,
-            handle.id as phone_or_email,
-            handle.service,
-            handle.uncanonicalized_id
-        FROM handle 
-        WHERE handle.ROWID = ?
-        """
-        cursor.execute(query, (handle_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
-    finally:
-        conn.close()
+    with borrow_conn() as conn:
+        row = conn.execute(f"{_HANDLE_SELECT} WHERE ROWID = ?", (handle_id,)).fetchone()
+        return dict(zip(HANDLE_COLUMNS, row)) if row is not None else None
 
 
 @mcp.prompt
@@ -0,0 +1,16 @@
+import sys
+
+import pytest
+
+from examples import imessage
+
+
+@pytest.fixture(scope="session")
+def contacts():
+    """Every contact in this Mac's address book, loaded once for the whole session"""
+    if sys.platform != "darwin":
+        pytest.skip("needs the macOS Contacts app")
+    contacts = imessage._load_contacts()
+    if not contacts:
+        pytest.skip("address book is empty")
+    return contacts
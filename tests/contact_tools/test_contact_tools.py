@@ -0,0 +1,57 @@
+"""Contact tools against the real address book, reusing one session-wide snapshot"""
+
+import pytest
+
+from examples import imessage
+
+pytestmark = pytest.mark.timeout(60)
+
+
+async def test_check_contacts_permission(contacts):
+    result = await imessage.check_contacts_permission.fn()
+    assert result["has_permission"] is True, result["message"]
+
+
+async def test_get_contacts_count(contacts):
+    result = await imessage.get_contacts_count.fn()
+    assert result["total_contacts"] == len(contacts)
+
+
+async def test_get_all_contacts_pages_through_everything(contacts):
+    seen = []
+    after_id = None
+    while True:
+        result = await imessage.get_all_contacts.fn(limit=50, after_id=after_id)
+        seen.extend(contact["id"] for contact in result["contacts"])
+        after_id = result["pagination"]["next_cursor"]
+        if after_id is None:
+            break
+    assert seen == [contact["id"] for contact in contacts]
+
+
+async def test_get_all_contacts_by_offset(contacts):
+    result = await imessage.get_all_contacts.fn(limit=5, offset=1)
+    assert result["contacts"] == contacts[1:6]
+    assert result["pagination"]["total"] == len(contacts)
+
+
+async def test_get_contacts_bundle(contacts):
+    result = await imessage.get_contacts_bundle.fn(limit=3)
+    assert result["total_contacts"] == len(contacts)
+    assert result["contacts"] == contacts[:3]
+
+
+async def test_find_contact_by_name(contacts):
+    contact = contacts[len(contacts) // 2]
+    result = await imessage.find_contact_by_name.fn(contact["name"], limit=50)
+    assert contact["name"] in [match["name"] for match in result["matches"]]
+
+
+@pytest.mark.integration
+@pytest.mark.timeout(300)
+def test_applescript_dump_matches_snapshot(contacts):
+    """The AppleScript fallback reads the same contacts as the database path"""
+    dumped = imessage._read_applescript_snapshot()
+    assert sorted(contact["id"] for contact in dumped) == [
+        contact["id"] for contact in contacts
+    ]
@@ -1,40 +1,36 @@
-#!/usr/bin/env python3
-"""Test sending iMessages"""
-import sys, os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-import examples.imessage as im
+"""send_message input validation, plus an opt-in real send"""
 
-def get_func(tool):
-    return tool.fn if hasattr(tool, 'fn') else tool
+import os
+import sys
+from datetime import datetime
 
-print("=" * 60)
-print("Testing send_message function")
-print("=" * 60)
+import pytest
 
-# Get user input for testing
-print("\nThis test will send a real iMessage.")
-print("Please enter the recipient details:\n")
+from examples import imessage
 
-phone = input("Enter phone number or email (or 'skip' to skip test): ").strip()
 
-if phone.lower() != 'skip':
-    message = input("Enter message text: ").strip()
-    
-    print(f"\n🔄 Attempting to send message to: {phone}")
-    print(f"   Message: {message}")
-    
-    func = get_func(im.send_message)
-    result = func(phone, message)
-    
-    if result.get("success"):
-        print(f"\n✅ SUCCESS: {result.get('message')}")
-    else:
-        print(f"\n❌ FAILED: {result.get('error')}")
-    
-    print("\nFull result:")
-    import json
-    print(json.dumps(result, indent=2))
-else:
-    print("\n⏭️ Test skipped")
+@pytest.mark.parametrize(
+    "phone_number, message, error",
+    [
+        ("", "Hello", "Phone number or email is required"),
+        ("   ", "Hello", "Phone number or email is required"),
+        ("1234567890", "", "Message text is required"),
+        ("1234567890", "  \n", "Message text is required"),
+    ],
+)
+async def test_send_message_validation(phone_number, message, error):
+    assert await imessage.send_message.fn(phone_number, message) == {"error": error}
 
-print("\n" + "=" * 60)
\ No newline at end of file
+
+@pytest.mark.integration
+@pytest.mark.timeout(30)
+@pytest.mark.skipif(sys.platform != "darwin", reason="needs the macOS Messages app")
+@pytest.mark.skipif(
+    not os.getenv("IMESSAGE_TEST_RECIPIENT"),
+    reason="set IMESSAGE_TEST_RECIPIENT to send a real test message",
+)
+async def test_send_message():
+    recipient = os.environ["IMESSAGE_TEST_RECIPIENT"]
+    message = f"Test message from FastMCP iMessage server - {datetime.now():%H:%M:%S}"
+    result = await imessage.send_message.fn(recipient, message)
+    assert result["success"] is True, result.get("error")
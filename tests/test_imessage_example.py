@@ -0,0 +1,1158 @@
+"""Tests for the iMessage example server against a synthetic chat.db"""
+
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+from examples import imessage
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+APPLE_EPOCH = 978307200
+
+# 2024-01-15 12:00:00 UTC, in Apple epoch nanoseconds
+BASE_DATE = (1705320000 - APPLE_EPOCH) * 1_000_000_000
+MINUTE = 60 * 1_000_000_000
+
+
+def local_date(minutes: int) -> str:
+    """Format a message date the way the tools do (local time)"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(1705320000 + minutes * 60))
+
+
+SCHEMA = """
+CREATE TABLE handle (
+    ROWID INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    service TEXT NOT NULL,
+    uncanonicalized_id TEXT
+);
+CREATE TABLE chat (
+    ROWID INTEGER PRIMARY KEY AUTOINCREMENT,
+    guid TEXT NOT NULL,
+    chat_identifier TEXT,
+    service_name TEXT,
+    room_name TEXT,
+    display_name TEXT,
+    last_read_message_timestamp INTEGER DEFAULT 0,
+    properties BLOB
+);
+CREATE TABLE message (
+    ROWID INTEGER PRIMARY KEY AUTOINCREMENT,
+    guid TEXT NOT NULL,
+    text TEXT,
+    attributedBody BLOB,
+    handle_id INTEGER DEFAULT 0,
+    date INTEGER,
+    is_from_me INTEGER DEFAULT 0
+);
+CREATE TABLE chat_message_join (
+    chat_id INTEGER,
+    message_id INTEGER,
+    message_date INTEGER DEFAULT 0,
+    PRIMARY KEY (chat_id, message_id)
+);
+CREATE TABLE chat_handle_join (
+    chat_id INTEGER,
+    handle_id INTEGER,
+    UNIQUE (chat_id, handle_id)
+);
+"""
+
+HANDLES = [
+    (1, "+15551234567", "iMessage", "5551234567"),
+    (2, "friend@example.com", "iMessage", None),
+]
+
+CHATS = [
+    (1, "iMessage;-;+15551234567", "+15551234567", "iMessage", None, None),
+    (2, "iMessage;+;chat42", "chat42", "iMessage", "chat42", "Weekend Plans"),
+]
+
+# (rowid, text, handle_id, minutes after BASE_DATE, is_from_me, chat_id)
+MESSAGES = [
+    (1, "Hey, are you around?", 1, 0, 0, 1),
+    (2, "Yes! What's up?", 0, 1, 1, 1),
+    (3, "Want to grab lunch?", 1, 2, 0, 1),
+    (4, "Who is in for hiking?", 2, 3, 0, 2),
+    (5, "Count me in", 1, 4, 0, 2),
+    (6, "Same here, lunch after?", 0, 5, 1, 2),
+    (7, None, 1, 6, 0, 1),
+]
+
+
+def build_chat_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO handle VALUES (?, ?, ?, ?)", HANDLES)
+    conn.executemany(
+        "INSERT INTO chat (ROWID, guid, chat_identifier, service_name, room_name, display_name) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        CHATS,
+    )
+    conn.executemany(
+        "INSERT INTO chat_handle_join VALUES (?, ?)", [(1, 1), (2, 1), (2, 2)]
+    )
+    for rowid, text, handle_id, minutes, is_from_me, chat_id in MESSAGES:
+        date = BASE_DATE + minutes * MINUTE
+        conn.execute(
+            "INSERT INTO message (ROWID, guid, text, handle_id, date, is_from_me) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (rowid, f"guid-{rowid}", text, handle_id, date, is_from_me),
+        )
+        conn.execute(
+            "INSERT INTO chat_message_join VALUES (?, ?, ?)", (chat_id, rowid, date)
+        )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def chat_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "chat.db"
+    build_chat_db(db_path)
+    monkeypatch.setattr(imessage, "IMESSAGES_DB_PATH", str(db_path))
+    monkeypatch.setattr(
+        imessage, "IMESSAGES_INDEX_PATH", str(tmp_path / "cache" / "index.db")
+    )
+    yield db_path
+    imessage.close_pool()
+
+
+def add_chat(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO chat (ROWID, guid, chat_identifier) VALUES (3, 'chat-guid-3', 'chat43')"
+    )
+    conn.commit()
+    conn.close()
+
+
+ADDRESSBOOK_SCHEMA = """
+CREATE TABLE ZABCDRECORD (
+    Z_PK INTEGER PRIMARY KEY,
+    ZFIRSTNAME VARCHAR,
+    ZLASTNAME VARCHAR,
+    ZORGANIZATION VARCHAR,
+    ZUNIQUEID VARCHAR
+);
+CREATE TABLE ZABCDPHONENUMBER (
+    Z_PK INTEGER PRIMARY KEY,
+    ZOWNER INTEGER,
+    ZLABEL VARCHAR,
+    ZFULLNUMBER VARCHAR
+);
+CREATE TABLE ZABCDEMAILADDRESS (
+    Z_PK INTEGER PRIMARY KEY,
+    ZOWNER INTEGER,
+    ZLABEL VARCHAR,
+    ZADDRESS VARCHAR
+);
+"""
+
+CONTACTS = [
+    (1, "Alex", "Rivera", None, "C0FFEE-3:ABPerson"),
+    (2, None, None, "Pizza Place", "C0FFEE-1:ABPerson"),
+    (3, "Sam", None, None, "C0FFEE-2:ABPerson"),
+]
+PHONES = [
+    (1, 1, "_$!<Mobile>!$_", "+1 (555) 123-4567"),
+    (2, 1, "_$!<Work>!$_", "555-000-1111"),
+    (3, 2, "_$!<Main>!$_", "+44 20 7946 0958"),
+]
+EMAILS = [(1, 1, "_$!<Home>!$_", "alex@example.com"), (2, 3, None, "sam@example.com")]
+
+
+@pytest.fixture
+def addressbook(tmp_path, monkeypatch):
+    root = tmp_path / "AddressBook"
+    db_path = root / "Sources" / "SOURCE-1" / "AddressBook-v22.abcddb"
+    db_path.parent.mkdir(parents=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(ADDRESSBOOK_SCHEMA)
+    conn.executemany("INSERT INTO ZABCDRECORD VALUES (?, ?, ?, ?, ?)", CONTACTS)
+    conn.executemany("INSERT INTO ZABCDPHONENUMBER VALUES (?, ?, ?, ?)", PHONES)
+    conn.executemany("INSERT INTO ZABCDEMAILADDRESS VALUES (?, ?, ?, ?)", EMAILS)
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(imessage, "ADDRESSBOOK_PATH", str(root))
+    return db_path
+
+
+class TestConnectionPool:
+    def test_connections_are_reused(self, chat_db):
+        with imessage.borrow_conn() as first:
+            pass
+        with imessage.borrow_conn() as second:
+            pass
+        assert first is second
+
+    def test_concurrent_borrows_get_distinct_connections(self, chat_db):
+        with imessage.borrow_conn() as first:
+            with imessage.borrow_conn() as second:
+                assert first is not second
+
+    def test_connections_are_read_only(self, chat_db):
+        with imessage.borrow_conn() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM message")
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+
+    def test_missing_database(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(imessage, "IMESSAGES_DB_PATH", str(tmp_path / "missing.db"))
+        with pytest.raises(FileNotFoundError):
+            with imessage.borrow_conn():
+                pass
+
+
+class TestMessageTools:
+    async def test_get_recent_messages(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_recent_messages", {"limit": 2})
+        messages = result.structured_content["result"]
+        assert [m["text"] for m in messages] == [
+            "Same here, lunch after?",
+            "Count me in",
+        ]
+        assert messages[0]["is_from_me"] is True
+        assert messages[0]["date"] == local_date(5)
+        assert messages[1]["contact"] == "+15551234567"
+
+    @pytest.mark.parametrize(
+        "contact, expected",
+        [
+            ("+15551234567", [5, 3, 1]),
+            ("(555) 123-4567", [5, 3, 1]),
+            ("1234567", [5, 3, 1]),
+            ("Friend@Example.com", [4]),
+            ("example.com", [4]),
+            ("friend1", []),
+            ("Alex 1", []),
+            ("chat123", []),
+            ("nobody", []),
+        ],
+    )
+    async def test_get_messages_from_contact(self, chat_db, contact, expected):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_messages_from_contact", {"contact": contact}
+            )
+        messages = result.structured_content["result"]
+        assert [m["guid"] for m in messages] == [f"guid-{rowid}" for rowid in expected]
+
+    async def test_search_messages(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("search_messages", {"search_term": "lunch"})
+        messages = result.structured_content["result"]
+        assert [m["guid"] for m in messages] == ["guid-6", "guid-3"]
+
+    async def test_missing_handles_reload_once(self, chat_db):
+        conn = sqlite3.connect(chat_db)
+        conn.executemany(
+            "INSERT INTO message (ROWID, guid, text, handle_id, date) VALUES (?, ?, 'orphan', 42, ?)",
+            [
+                (rowid, f"guid-{rowid}", BASE_DATE + rowid * MINUTE)
+                for rowid in (8, 9, 10)
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        statements = []
+        with imessage.borrow_conn() as pooled:
+            pooled.set_trace_callback(statements.append)
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "search_messages", {"search_term": "orphan"}
+            )
+        assert [m["contact"] for m in result.structured_content["result"]] == [None] * 3
+        assert statements.count("SELECT ROWID, id FROM handle") == 1
+
+    async def test_get_message(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_message", {"message_id": 4})
+        assert result.data["text"] == "Who is in for hiking?"
+        assert result.data["sender_id"] == "friend@example.com"
+
+    async def test_get_chat_participant_handles(self, chat_db):
+        conn = sqlite3.connect(chat_db)
+        conn.execute("INSERT INTO chat_handle_join VALUES (2, 42)")
+        conn.commit()
+        conn.close()
+
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_chat_participant_handles", {"chat_id": 2}
+            )
+        assert sorted(result.structured_content["result"]) == [
+            "+15551234567",
+            "friend@example.com",
+        ]
+
+    async def test_get_chat_by_id(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_chat_by_id", {"chat_id": 2})
+        assert result.data == {
+            "ROWID": 2,
+            "chat_identifier": "chat42",
+            "display_name": "Weekend Plans",
+            "service_name": "iMessage",
+            "room_name": "chat42",
+            "last_read_message_timestamp": 0,
+        }
+
+    async def test_get_chat_by_identifier_columns(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_chat_by_identifier",
+                {"chat_identifier": "chat42", "columns": ["guid", "display_name"]},
+            )
+            assert result.data == {
+                "ROWID": 2,
+                "guid": "iMessage;+;chat42",
+                "display_name": "Weekend Plans",
+            }
+
+            with pytest.raises(ToolError, match="Unknown chat columns: 1; DROP"):
+                await client.call_tool(
+                    "get_chat_by_identifier",
+                    {"chat_identifier": "chat42", "columns": ["1; DROP TABLE chat"]},
+                )
+
+    async def test_chat_lookups_are_cached(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            await client.call_tool(
+                "get_chat_by_id", {"chat_id": 2, "columns": ["guid"]}
+            )
+
+            conn = sqlite3.connect(chat_db)
+            conn.execute("UPDATE chat SET guid = 'renamed' WHERE ROWID = 2")
+            conn.commit()
+            conn.close()
+
+            cached = await client.call_tool(
+                "get_chat_by_id", {"chat_id": 2, "columns": ["guid"]}
+            )
+            fresh = await client.call_tool(
+                "get_chat_by_id", {"chat_id": 2, "columns": ["guid", "display_name"]}
+            )
+        assert cached.data["guid"] == "iMessage;+;chat42"
+        assert fresh.data["guid"] == "renamed"
+
+    async def test_get_conversation_list(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_conversation_list", {})
+        conversations = result.structured_content["result"]
+        assert conversations == [
+            {
+                "chat_id": "+15551234567",
+                "display_name": "+15551234567",
+                "last_message_date": local_date(6),
+                "message_count": 4,
+                "last_message": None,
+            },
+            {
+                "chat_id": "chat42",
+                "display_name": "Weekend Plans",
+                "last_message_date": local_date(5),
+                "message_count": 3,
+                "last_message": "Same here, lunch after?",
+            },
+        ]
+
+    async def test_get_message_stats(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_message_stats", {})
+        assert result.data == {
+            "total_messages": 6,
+            "sent_messages": 2,
+            "received_messages": 4,
+            "total_contacts": 3,
+            "total_conversations": 2,
+        }
+
+    async def test_stats_are_cached(self, chat_db, monkeypatch):
+        async with Client(imessage.mcp) as client:
+            await client.call_tool("get_message_stats", {})
+            add_chat(chat_db)
+
+            result = await client.call_tool("get_message_stats", {})
+            assert result.data["total_conversations"] == 2
+
+            now = time.monotonic()
+            monkeypatch.setattr(
+                imessage.time, "monotonic", lambda: now + imessage.STATS_TTL
+            )
+            result = await client.call_tool("get_message_stats", {})
+            assert result.data["total_conversations"] == 3
+
+    async def test_total_chat_count_follows_database_changes(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            before = await client.call_tool("get_total_chat_count", {})
+            add_chat(chat_db)
+            after = await client.call_tool("get_total_chat_count", {})
+        assert (before.data, after.data) == (2, 3)
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        ("(555) 123-4567", "15551234567"),
+        ("+1 555.123.4567", "15551234567"),
+        ("+44 20 7946 0958", "442079460958"),
+        ("friend@example.com", ""),
+    ],
+)
+def test_normalize_phone(phone, expected):
+    assert imessage.normalize_phone(phone) == expected
+
+
+async def test_get_handles(chat_db):
+    async with Client(imessage.mcp) as client:
+        result = await client.call_tool("get_handles", {"limit": 1})
+        assert result.structured_content["result"] == [
+            {
+                "id": 1,
+                "phone_or_email": "+15551234567",
+                "service": "iMessage",
+                "uncanonicalized_id": "5551234567",
+            }
+        ]
+        result = await client.call_tool("get_handle_details", {"handle_id": 99})
+        assert result.structured_content["result"] is None
+
+
+class TestDateFilters:
+    @pytest.mark.parametrize(
+        "date",
+        [
+            "2024-01-15T12:02:00Z",
+            "2024-01-15T12:02:00+00:00",
+            str(BASE_DATE + 2 * MINUTE),
+        ],
+    )
+    async def test_get_messages_before_date(self, chat_db, date):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_messages_before_date", {"chat_id": 1, "date": date}
+            )
+        assert [m["id"] for m in result.structured_content["result"]] == [2, 1]
+
+    async def test_get_messages_after_date(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_messages_after_date",
+                {"chat_id": 2, "date": "2024-01-15T12:03:00Z"},
+            )
+        assert [m["id"] for m in result.structured_content["result"]] == [5, 6]
+
+    async def test_get_messages_same_date(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_messages_same_date",
+                {"chat_id": 2, "date": "2024-01-15T12:04:00Z"},
+            )
+        assert [m["id"] for m in result.structured_content["result"]] == [5]
+
+    async def test_get_unique_senders_since(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_unique_senders_since", {"date": "2024-01-15T12:00:00Z"}
+            )
+        assert result.data == 2
+
+    async def test_get_distinct_senders_since(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_distinct_senders_since", {"date": "2024-01-15T12:03:00Z"}
+            )
+        assert result.structured_content["result"] == [
+            {"sender_id": "+15551234567", "messages": 2},
+            {"sender_id": "friend@example.com", "messages": 1},
+        ]
+
+    async def test_get_all_messages_by_date(self, chat_db):
+        day = local_date(0)[:10]
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_all_messages_by_date", {"target_date": day}
+            )
+        assert result.data["total_messages"] == 6
+        first = result.data["messages"][0]
+        assert first["text"] == "Hey, are you around?"
+        assert first["contact"] == "+15551234567"
+        assert first["chat_name"] is None
+        assert first["date_time"] == local_date(0)
+        assert first["time_only"] == local_date(0)[11:]
+        assert result.data["stats"]["most_active_chat"] == "+15551234567"
+
+
+class TestPagination:
+    async def test_get_messages_pages_newest_first(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            first = await client.call_tool("get_messages", {"chat_id": 1, "limit": 2})
+            second = await client.call_tool(
+                "get_messages",
+                {"chat_id": 1, "limit": 2, "cursor": first.data["next_cursor"]},
+            )
+        assert [m["id"] for m in first.data["messages"]] == [7, 3]
+        assert [m["id"] for m in second.data["messages"]] == [2, 1]
+        assert "apple_date" not in first.data["messages"][0]
+
+    async def test_get_messages_pages_oldest_first(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            first = await client.call_tool(
+                "get_messages", {"chat_id": 1, "limit": 3, "order": "ASC"}
+            )
+            second = await client.call_tool(
+                "get_messages",
+                {
+                    "chat_id": 1,
+                    "limit": 3,
+                    "order": "ASC",
+                    "cursor": first.data["next_cursor"],
+                },
+            )
+        assert [m["id"] for m in first.data["messages"]] == [1, 2, 3]
+        assert [m["id"] for m in second.data["messages"]] == [7]
+        assert second.data["next_cursor"] is None
+
+    async def test_get_messages_rejects_unknown_order(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_messages", {"chat_id": 2, "order": "ASC; DROP TABLE message"}
+            )
+        assert [m["id"] for m in result.data["messages"]] == [6, 5, 4]
+
+    async def test_get_chat_names_pages(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            first = await client.call_tool("get_chat_names", {"limit": 1})
+            second = await client.call_tool(
+                "get_chat_names", {"limit": 1, "cursor": first.data["next_cursor"]}
+            )
+        assert [c["ROWID"] for c in first.data["chats"]] == [2]
+        assert [c["ROWID"] for c in second.data["chats"]] == [1]
+
+    @pytest.mark.parametrize(
+        "tool, arguments, cursor",
+        [
+            ("get_messages", {"chat_id": 1}, "not a cursor"),
+            ("get_messages", {"chat_id": 1}, "NQ=="),  # 5
+            ("get_messages", {"chat_id": 1}, "WzFd"),  # [1]
+            ("get_messages", {"chat_id": 1}, "WyJhIiwgMV0="),  # ["a", 1]
+            ("get_chat_names", {}, "NQ=="),
+            ("get_chat_names", {}, "WzEsIDJd"),  # [1, 2]
+            ("get_chat_names", {}, "WyJhIl0="),  # ["a"]
+        ],
+    )
+    async def test_invalid_cursor(self, chat_db, tool, arguments, cursor):
+        async with Client(imessage.mcp) as client:
+            with pytest.raises(ToolError, match="Invalid pagination cursor"):
+                await client.call_tool(tool, arguments | {"cursor": cursor})
+
+
+class TestSearchIndex:
+    async def test_search_uses_index(self, chat_db, tmp_path):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("search_messages", {"search_term": "hik"})
+        assert [m["guid"] for m in result.structured_content["result"]] == ["guid-4"]
+        assert (tmp_path / "cache" / "index.db").exists()
+
+    async def test_search_picks_up_new_messages(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            await client.call_tool("search_messages", {"search_term": "lunch"})
+
+            conn = sqlite3.connect(chat_db)
+            conn.execute(
+                "INSERT INTO message (ROWID, guid, text, handle_id, date) "
+                "VALUES (8, 'guid-8', 'lunch is ready', 1, ?)",
+                (BASE_DATE + 10 * MINUTE,),
+            )
+            conn.commit()
+            conn.close()
+
+            result = await client.call_tool("search_messages", {"search_term": "lunch"})
+        assert [m["guid"] for m in result.structured_content["result"]] == [
+            "guid-8",
+            "guid-6",
+            "guid-3",
+        ]
+
+    @pytest.mark.parametrize("term", ['"', "AND", "lunch OR hiking", "NEAR("])
+    async def test_search_syntax_is_inert(self, chat_db, term):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("search_messages", {"search_term": term})
+        assert result.structured_content["result"] == []
+
+    @pytest.mark.parametrize(
+        "term, expected",
+        [
+            ("?", [6, 4, 3, 2, 1]),
+            ("...", []),
+            ("unch", [6, 3]),
+            ("What's", [2]),
+        ],
+    )
+    async def test_search_falls_back_to_scan(self, chat_db, term, expected):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("search_messages", {"search_term": term})
+        assert [m["guid"] for m in result.structured_content["result"]] == [
+            f"guid-{rowid}" for rowid in expected
+        ]
+
+    async def test_search_finds_edited_messages(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            await client.call_tool("search_messages", {"search_term": "lunch"})
+
+            conn = sqlite3.connect(chat_db)
+            conn.execute(
+                "UPDATE message SET text = 'Count me in for brunch' WHERE ROWID = 5"
+            )
+            conn.commit()
+            conn.close()
+
+            result = await client.call_tool(
+                "search_messages", {"search_term": "brunch"}
+            )
+        assert [m["guid"] for m in result.structured_content["result"]] == ["guid-5"]
+
+    async def test_refresh_only_counts_new_messages(self, chat_db):
+        async with Client(imessage.mcp) as client:
+            await client.call_tool("search_messages", {"search_term": "lunch"})
+
+            conn = sqlite3.connect(chat_db)
+            conn.execute(
+                "INSERT INTO message (ROWID, guid, text, handle_id, date) "
+                "VALUES (8, 'guid-8', 'lunch is ready', 1, ?)",
+                (BASE_DATE + 10 * MINUTE,),
+            )
+            conn.commit()
+            conn.close()
+
+            statements = []
+            imessage._INDEX_CONN.set_trace_callback(statements.append)
+            await client.call_tool("search_messages", {"search_term": "lunch"})
+        counts = [sql for sql in statements if "COUNT(*)" in sql]
+        assert counts and all("ROWID >" in sql for sql in counts)
+
+    async def test_optimize_index(self, chat_db):
+        assert imessage.optimize_index() is False
+        async with Client(imessage.mcp) as client:
+            await client.call_tool("search_messages", {"search_term": "lunch"})
+        assert imessage.optimize_index() is True
+
+    async def test_falls_back_to_scan_without_index(self, chat_db, monkeypatch):
+        monkeypatch.setattr(imessage, "refresh_search_index", lambda: False)
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("search_messages", {"search_term": "unch"})
+        assert [m["guid"] for m in result.structured_content["result"]] == [
+            "guid-6",
+            "guid-3",
+        ]
+
+
+class TestChatIndex:
+    @pytest.fixture(params=[True, False], ids=["sidecar", "chat.db"])
+    def indexed_chat_db(self, request, chat_db, monkeypatch):
+        if not request.param:
+            monkeypatch.setattr(imessage, "refresh_chat_index", lambda: False)
+        return chat_db
+
+    async def test_get_messages(self, indexed_chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_messages", {"chat_id": 2})
+        assert [m["id"] for m in result.data["messages"]] == [6, 5, 4]
+
+    async def test_get_conversation_list(self, indexed_chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_conversation_list", {})
+        assert [
+            (c["chat_id"], c["message_count"], c["last_message"])
+            for c in result.structured_content["result"]
+        ] == [("+15551234567", 4, None), ("chat42", 3, "Same here, lunch after?")]
+
+    async def test_get_conversation_list_after_deleting_last_message(
+        self, indexed_chat_db
+    ):
+        async with Client(imessage.mcp) as client:
+            await client.call_tool("get_conversation_list", {})
+
+            conn = sqlite3.connect(indexed_chat_db)
+            conn.execute("DELETE FROM message WHERE ROWID = 6")
+            conn.commit()
+            conn.close()
+            imessage.prune_indexes()
+
+            result = await client.call_tool("get_conversation_list", {})
+        assert [
+            (c["chat_id"], c["message_count"], c["last_message"])
+            for c in result.structured_content["result"]
+        ] == [("+15551234567", 4, None), ("chat42", 2, "Count me in")]
+
+    async def test_get_conversation_list_breaks_date_ties_on_newest_id(
+        self, indexed_chat_db
+    ):
+        conn = sqlite3.connect(indexed_chat_db)
+        date = BASE_DATE + 10 * MINUTE
+        for rowid, text in [(8, "first"), (9, "second")]:
+            conn.execute(
+                "INSERT INTO message (ROWID, guid, text, handle_id, date) "
+                "VALUES (?, ?, ?, 2, ?)",
+                (rowid, f"guid-{rowid}", text, date),
+            )
+            conn.execute(
+                "INSERT INTO chat_message_join VALUES (2, ?, ?)", (rowid, date)
+            )
+        conn.commit()
+        conn.close()
+
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_conversation_list", {"limit": 1})
+            last_id = await client.call_tool(
+                "get_last_message_id_from_chat", {"chat_id": 2}
+            )
+        assert result.structured_content["result"][0]["last_message"] == "second"
+        assert last_id.data == 9
+
+    async def test_get_message_count(self, indexed_chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_message_count", {"chat_id": "1"})
+        assert result.data == 4
+
+    async def test_get_last_message_date_from_chat(self, indexed_chat_db):
+        async with Client(imessage.mcp) as client:
+            last = await client.call_tool(
+                "get_last_message_date_from_chat", {"chat_id": 2}
+            )
+            missing = await client.call_tool(
+                "get_last_message_date_from_chat", {"chat_id": 99}
+            )
+        assert last.data == local_date(5)
+        assert missing.data is None
+
+    async def test_get_messages_batch(self, indexed_chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_messages_batch", {"chat_ids": [1, 2, 99], "limit": 2}
+            )
+        batch = result.structured_content
+        assert {
+            chat_id: [m["id"] for m in messages] for chat_id, messages in batch.items()
+        } == {
+            "1": [7, 3],
+            "2": [6, 5],
+            "99": [],
+        }
+        assert batch["2"][0]["sender_id"] is None
+        assert batch["2"][1]["sender_id"] == "+15551234567"
+
+    async def test_get_messages_before(self, indexed_chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_messages_before", {"chat_id": 1, "message_id": 3}
+            )
+        assert [m["id"] for m in result.structured_content["result"]] == [1, 2]
+
+    async def test_get_messages_after_id(self, indexed_chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_messages_after_id", {"chat_id": 1, "message_id": 2}
+            )
+        assert [m["id"] for m in result.structured_content["result"]] == [3, 7]
+
+    async def test_get_last_message_id_from_chat(self, indexed_chat_db):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool(
+                "get_last_message_id_from_chat", {"chat_id": 2}
+            )
+        assert result.data == 6
+
+    async def test_index_picks_up_new_messages(self, indexed_chat_db):
+        async with Client(imessage.mcp) as client:
+            await client.call_tool("get_last_message_id_from_chat", {"chat_id": 2})
+
+            conn = sqlite3.connect(indexed_chat_db)
+            conn.execute(
+                "INSERT INTO message (ROWID, guid, text, handle_id, date) "
+                "VALUES (8, 'guid-8', 'See you there', 2, ?)",
+                (BASE_DATE + 10 * MINUTE,),
+            )
+            conn.execute("INSERT INTO chat_message_join VALUES (2, 8, 0)")
+            conn.commit()
+            conn.close()
+
+            result = await client.call_tool(
+                "get_last_message_id_from_chat", {"chat_id": 2}
+            )
+        assert result.data == 8
+
+    async def test_index_drops_deleted_messages(self, indexed_chat_db):
+        async with Client(imessage.mcp) as client:
+            await client.call_tool("get_messages", {"chat_id": 2})
+
+            conn = sqlite3.connect(indexed_chat_db)
+            conn.execute("DELETE FROM message WHERE ROWID = 6")
+            conn.execute("DELETE FROM chat_message_join WHERE message_id = 6")
+            conn.commit()
+            conn.close()
+            imessage.prune_indexes()
+
+            messages = await client.call_tool("get_messages", {"chat_id": 2})
+            last = await client.call_tool(
+                "get_last_message_date_from_chat", {"chat_id": 2}
+            )
+        assert [m["id"] for m in messages.data["messages"]] == [5, 4]
+        assert last.data == local_date(4)
+
+
+@pytest.fixture
+def empty_contacts_cache(tmp_path, monkeypatch):
+    """Start from an empty contact snapshot, with nothing saved on disk"""
+    monkeypatch.setattr(
+        imessage, "CONTACTS_CACHE_PATH", str(tmp_path / "cache" / "contacts.json")
+    )
+    monkeypatch.setattr(
+        imessage,
+        "_contacts_cache",
+        dict.fromkeys(imessage._contacts_cache, None) | {"loaded_at": 0.0},
+    )
+
+
+@pytest.fixture
+def contacts_dump(empty_contacts_cache, monkeypatch):
+    """Serve a fixed AppleScript contact dump, recording each run"""
+    runs = []
+
+    def dump(script, timeout=30):
+        runs.append(script)
+        return "\x1e".join(
+            "\x1f".join(fields)
+            for fields in [
+                ("Sam", "", "work: sam@example.com", "B2"),
+                ("Pizza Place", "work: +44 20 7946 0958", "", "C3"),
+                ("Alex Rivera", "mobile: 555-123-4567", "home: alex@example.com", "A1"),
+            ]
+        )
+
+    monkeypatch.setattr(imessage, "run_applescript", dump)
+    return runs
+
+
+class TestContacts:
+    async def test_get_all_contacts_pages_by_cursor(self, contacts_dump):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_all_contacts", {"limit": 2})
+            first = result.data
+            result = await client.call_tool(
+                "get_all_contacts",
+                {"limit": 2, "after_id": first["pagination"]["next_cursor"]},
+            )
+            second = result.data
+        assert [contact["name"] for contact in first["contacts"]] == [
+            "Alex Rivera",
+            "Sam",
+        ]
+        assert first["contacts"][0] == {
+            "id": "A1",
+            "name": "Alex Rivera",
+            "phones": ["mobile: 555-123-4567"],
+            "emails": ["home: alex@example.com"],
+        }
+        assert first["pagination"]["next_cursor"] == "B2"
+        assert first["pagination"]["has_more"] is True
+        assert [contact["name"] for contact in second["contacts"]] == ["Pizza Place"]
+        assert second["pagination"]["has_more"] is False
+        assert second["pagination"]["next_cursor"] is None
+        assert len(contacts_dump) == 1
+
+    async def test_get_all_contacts_keeps_shared_names(
+        self, contacts_dump, monkeypatch
+    ):
+        dump = imessage.run_applescript
+
+        def with_namesake(script, timeout=30):
+            return dump(script, timeout) + "\x1eSam\x1f555-999-0000\x1f\x1fD4"
+
+        monkeypatch.setattr(imessage, "run_applescript", with_namesake)
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_all_contacts", {})
+        contacts = result.data["contacts"]
+        assert result.data["contacts_by_name"]["Sam"] == [1, 3]
+        assert [contacts[i]["id"] for i in result.data["contacts_by_name"]["Sam"]] == [
+            "B2",
+            "D4",
+        ]
+
+    async def test_get_contacts_bundle(self, contacts_dump):
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_contacts_bundle", {"limit": 1})
+            bundle = result.data
+            result = await client.call_tool("check_contacts_permission", {})
+            assert result.data["has_permission"] is True
+        assert bundle["permission"]["has_permission"] is True
+        assert bundle["total_contacts"] == 3
+        assert [contact["name"] for contact in bundle["contacts"]] == ["Alex Rivera"]
+        assert bundle["pagination"]["next_cursor"] == "A1"
+        assert len(contacts_dump) == 1
+
+    async def test_get_contacts_bundle_without_permission(
+        self, empty_contacts_cache, monkeypatch
+    ):
+        def denied(script, timeout=30):
+            raise Exception("Permission denied: Please grant Contacts access.")
+
+        monkeypatch.setattr(imessage, "run_applescript", denied)
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_contacts_bundle", {})
+        assert result.data["permission"]["has_permission"] is False
+        assert "instructions" in result.data["permission"]
+        assert result.data["contacts"] == []
+
+    async def test_get_contacts_bundle_probes_permission_for_addressbook(
+        self, addressbook, empty_contacts_cache, monkeypatch
+    ):
+        def denied(script, timeout=30):
+            raise Exception("Permission denied: Please grant Contacts access.")
+
+        monkeypatch.setattr(imessage, "run_applescript", denied)
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_contacts_bundle", {})
+        assert result.data["permission"]["has_permission"] is False
+        assert result.data["total_contacts"] == 3
+        assert len(result.data["contacts"]) == 3
+
+    @pytest.mark.parametrize(
+        "name, expected",
+        [
+            ("rivera", ["Alex Rivera"]),
+            ("A", ["Alex Rivera", "Sam", "Pizza Place"]),
+            ("ZA P", ["Pizza Place"]),
+            ("Sam Smith", ["Sam"]),
+            ("nobody", []),
+        ],
+    )
+    async def test_find_contact_by_name_falls_back_to_snapshot(
+        self, contacts_dump, tmp_path, monkeypatch, name, expected
+    ):
+        monkeypatch.setattr(imessage, "ADDRESSBOOK_PATH", str(tmp_path / "missing"))
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("find_contact_by_name", {"name": name})
+        assert [match["name"] for match in result.data["matches"]] == expected
+
+    @pytest.mark.parametrize(
+        "name, expected",
+        [
+            (
+                "rivera",
+                [
+                    {
+                        "name": "Alex Rivera",
+                        "phones": ["mobile: +1 (555) 123-4567", "work: 555-000-1111"],
+                        "emails": ["home: alex@example.com"],
+                    }
+                ],
+            ),
+            (
+                "PIZZA",
+                [
+                    {
+                        "name": "Pizza Place",
+                        "phones": ["main: +44 20 7946 0958"],
+                        "emails": [],
+                    }
+                ],
+            ),
+            (
+                "Sam Smith",
+                [{"name": "Sam", "phones": [], "emails": ["sam@example.com"]}],
+            ),
+            ("100%", []),
+        ],
+    )
+    async def test_find_contact_by_name(self, addressbook, monkeypatch, name, expected):
+        monkeypatch.setattr(imessage, "run_applescript", pytest.fail)
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("find_contact_by_name", {"name": name})
+        assert result.data["matches"] == expected
+
+    @pytest.mark.parametrize(
+        "handle, expected",
+        [
+            ("(555) 000-1111", ["Alex Rivera"]),
+            ("+15551234567", ["Alex Rivera"]),
+            ("+44 20 7946 0958", ["Pizza Place"]),
+            ("SAM@example.com", ["Sam"]),
+        ],
+    )
+    async def test_find_contact_by_handle(
+        self, addressbook, monkeypatch, handle, expected
+    ):
+        monkeypatch.setattr(imessage, "run_applescript", pytest.fail)
+        monkeypatch.setattr(imessage, "_search_addressbook", pytest.fail)
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("find_contact_by_name", {"name": handle})
+        assert [match["name"] for match in result.data["matches"]] == expected
+
+    async def test_contact_snapshot_follows_addressbook(
+        self, addressbook, empty_contacts_cache, monkeypatch
+    ):
+        monkeypatch.setattr(imessage, "run_applescript", pytest.fail)
+        async with Client(imessage.mcp) as client:
+            result = await client.call_tool("get_all_contacts", {})
+            contacts = result.data["contacts"]
+            assert [contact["name"] for contact in contacts] == [
+                "Pizza Place",
+                "Sam",
+                "Alex Rivera",
+            ]
+            assert contacts[2] == {
+                "id": "C0FFEE-3:ABPerson",
+                "name": "Alex Rivera",
+                "phones": ["mobile: +1 (555) 123-4567", "work: 555-000-1111"],
+                "emails": ["home: alex@example.com"],
+            }
+
+            conn = sqlite3.connect(addressbook)
+            conn.execute(
+                "INSERT INTO ZABCDRECORD VALUES (4, 'Jo', NULL, NULL, 'C0FFEE-4:ABPerson')"
+            )
+            conn.commit()
+            conn.close()
+            stat = addressbook.stat()
+            os.utime(
+                addressbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000)
+            )
+
+            result = await client.call_tool("get_contacts_count", {})
+        assert result.data["total_contacts"] == 4
+
+    def test_applescript_dump_is_saved_between_runs(
+        self, contacts_dump, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(imessage, "ADDRESSBOOK_PATH", str(tmp_path / "missing"))
+        assert len(imessage._load_contacts()) == 3
+
+        empty = dict.fromkeys(imessage._contacts_cache, None) | {"loaded_at": 0.0}
+        monkeypatch.setattr(imessage, "_contacts_cache", dict(empty))
+        imessage.warm_contacts()
+        assert imessage._contacts_cache["source"] == "saved"
+        assert [contact["id"] for contact in imessage._contacts_cache["data"]] == [
+            "A1",
+            "B2",
+            "C3",
+        ]
+        assert len(contacts_dump) == 1
+
+        now = time.time()
+        monkeypatch.setattr(
+            imessage.time, "time", lambda: now + imessage.CONTACTS_SAVED_TTL
+        )
+        monkeypatch.setattr(imessage, "_contacts_cache", dict(empty))
+        imessage.warm_contacts()
+        assert imessage._contacts_cache["data"] is None
+
+    def test_saved_dump_follows_addressbook(self, addressbook, empty_contacts_cache):
+        signature = imessage._addressbook_signature()
+        saved = [{"id": "X", "name": "Saved", "phones": [], "emails": []}]
+        imessage._save_contacts(signature, saved)
+        assert imessage._load_contacts() == saved
+
+        stat = addressbook.stat()
+        os.utime(addressbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert len(imessage._load_contacts()) == 3
+
+    def test_warm_contacts_reads_addressbook(
+        self, addressbook, empty_contacts_cache, monkeypatch
+    ):
+        monkeypatch.setattr(imessage, "run_applescript", pytest.fail)
+        imessage.warm_contacts()
+        assert imessage._contacts_cache["source"] == "addressbook"
+        assert len(imessage._contacts_cache["data"]) == 3
+
+    def test_warm_contacts_skips_applescript(
+        self, contacts_dump, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(imessage, "ADDRESSBOOK_PATH", str(tmp_path / "missing"))
+        imessage.warm_contacts()
+        assert imessage._contacts_cache["data"] is None
+        assert contacts_dump == []
+
+
+FAKE_OSASCRIPT = """\
+import json, os, re, sys, time
+
+with open(os.environ["OSASCRIPT_STARTS"], "a") as f:
+    f.write("started\\n")
+for line in sys.stdin:
+    sys.stdout.write(">> ")
+    if line.startswith("run script "):
+        wrapper = json.loads(line[len("run script "):])
+        with open(re.search(r'POSIX file "(.*?)"', wrapper)[1]) as f:
+            script = f.read()
+        if "HANG" in script:
+            time.sleep(10)
+        elif "DENIED" in script:
+            result = "__osascript_error__-1743|Not authorized to send Apple events to Contacts."
+        elif "ECHO" in script:
+            result = wrapper.partition(" with parameters ")[2].partition("\\n")[0]
+        else:
+            result = 'line one\\nsaid "hi"'
+    else:
+        result = json.loads(line)
+    sys.stdout.write("=> " + json.dumps(result) + "\\n")
+    sys.stdout.flush()
+"""
+
+# Stands in for osacompile by copying the source as the "compiled" script
+FAKE_OSACOMPILE = """\
+import shutil, sys
+
+shutil.copy(sys.argv[3], sys.argv[2])
+"""
+
+
+class TestOsascriptWorker:
+    @pytest.fixture
+    def starts(self, tmp_path, monkeypatch):
+        for name, source in [
+            ("osascript", FAKE_OSASCRIPT),
+            ("osacompile", FAKE_OSACOMPILE),
+        ]:
+            script = tmp_path / name
+            script.write_text(f"#!{sys.executable}\n" + source)
+            script.chmod(0o755)
+        monkeypatch.setattr(
+            imessage, "APPLESCRIPT_CACHE_DIR", str(tmp_path / "compiled")
+        )
+        imessage._compiled_applescript.cache_clear()
+        starts = tmp_path / "starts"
+        starts.touch()
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setenv("OSASCRIPT_STARTS", str(starts))
+        worker = imessage._OsascriptWorker()
+        monkeypatch.setattr(imessage, "_OSASCRIPT", worker)
+        yield starts
+        worker.close()
+
+    def test_scripts_share_one_process(self, starts):
+        for _ in range(3):
+            assert imessage.run_applescript('return "x"') == 'line one\nsaid "hi"'
+        assert starts.read_text().count("started") == 1
+
+    def test_arguments_are_passed_not_interpolated(self, starts):
+        result = imessage.run_applescript("ECHO", args=['say "hi"', "back\\slash"])
+        assert result == '{"say \\"hi\\"", "back\\\\slash"}'
+
+    def test_permission_errors(self, starts):
+        with pytest.raises(Exception, match="Permission denied"):
+            imessage.run_applescript("DENIED")
+
+    def test_timeout_restarts_the_process(self, starts):
+        with pytest.raises(Exception, match="timed out"):
+            imessage.run_applescript("HANG", timeout=1)
+        assert imessage.run_applescript('return "x"') == 'line one\nsaid "hi"'
+        assert starts.read_text().count("started") == 2